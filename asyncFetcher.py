@@ -0,0 +1,261 @@
+#
+# asyncFetcher.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: Optional asyncio fetch backend for `jsonCreator.py`. Sprint
+#              listing, issue search paging, worklog backfill and changelog
+#              backfill run as coroutines on one event loop over aiohttp, so
+#              a single process can keep many Jira requests in flight
+#              without a thread per request.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlencode
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from issueStore import to_resource
+from rawIssues import bulk_changelog_request, changelog_targets, dedupe_search_results, embedded_histories, id_batches, id_query, merge_bulk_changelogs, remaining_page_starts, set_complete_changelogs, set_complete_worklogs, truncated_worklog_issues
+from requestScheduler import THROTTLE_STATUSES, AdaptiveConcurrency
+
+SPRINT_PAGE_SIZE = 50
+
+class AsyncJiraFetcher:
+    def __init__(self, server, basic_auth, rate=10.0, max_concurrency=64, pool_size=64, timeout=60.0, keep_alive=True, compression=True,
+                 page_size=100, changelog_batch_size=1000, max_retries=5, base_backoff=1.0, max_backoff=60.0, cassette=None, report=None):
+        if aiohttp is None:
+            raise RuntimeError("The asyncio backend needs aiohttp. Install it with: pip install aiohttp")
+        self.server = server.rstrip("/")
+        self.basic_auth = basic_auth
+        self.rate = rate
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.compression = compression
+        self.page_size = page_size
+        self.changelog_batch_size = changelog_batch_size
+        self.max_retries = max_retries
+        self.cassette = cassette
+        self.report = report
+        self.is_cloud = False
+
+        # Only touched from the event loop thread, so it needs no lock of its own.
+        self.concurrency = AdaptiveConcurrency(max_concurrency, 1, base_backoff, max_backoff)
+        self._in_flight = 0
+        self._next_send_at = 0.0
+        self._started_at = time.monotonic()
+        self.requests = 0
+        self.failures = 0
+
+        # Callers stay synchronous: each method submits a coroutine to this loop and waits for its result.
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="jira-asyncio", daemon=True)
+        self._thread.start()
+        try:
+            self._run(self._open())
+        except Exception:
+            self.close()
+            raise
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _open(self):
+        # The session and semaphore must be created on the loop that uses them.
+        self._slots = asyncio.Condition()
+        self._session = aiohttp.ClientSession(
+            auth=aiohttp.BasicAuth(*self.basic_auth),
+            connector=aiohttp.TCPConnector(limit=self.pool_size, force_close=not self.keep_alive),
+            timeout=aiohttp.ClientTimeout(sock_connect=self.timeout, sock_read=self.timeout),
+            headers={} if self.compression else {"Accept-Encoding": "identity"},
+        )
+        server_info = await self._request("GET", "/rest/api/2/serverInfo")
+        self.is_cloud = server_info.get("deploymentType") == "Cloud"
+
+    async def _close(self):
+        await self._session.close()
+
+    def close(self):
+        if getattr(self, "_session", None) is not None:
+            self._run(self._close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    @asynccontextmanager
+    async def _slot(self):
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < self.concurrency.concurrency_limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._slots:
+                self._in_flight -= 1
+                self._slots.notify_all()
+
+    async def _wait_turn(self):
+        # Space requests out to the configured rate and hold all of them while the server has asked for a pause.
+        now = time.monotonic()
+        send_at = max(now, self._next_send_at, self.concurrency.paused_until)
+        self._next_send_at = send_at + 1 / self.rate
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def _request(self, method, path, params=None, json_body=None):
+        params = {key: str(value) for key, value in (params or {}).items() if value is not None}
+        url = f"{self.server}{path}"
+        body = json.dumps(json_body) if json_body is not None else None
+        if self.cassette and self.cassette.replaying:
+            content = self.cassette.replay(method, f"{url}?{urlencode(params)}", body)[2]
+            return json.loads(content) if content else None
+
+        for attempt in range(self.max_retries + 1):
+            async with self._slot():
+                await self._wait_turn()
+                started = time.perf_counter()
+                async with self._session.request(method, url, params=params, data=body, headers={"Content-Type": "application/json"} if body else None) as response:
+                    content = await response.read()
+                    if self.report:
+                        self.report.record_request(method, url, response.status, len(content), time.perf_counter() - started)
+                    if response.status in THROTTLE_STATUSES and attempt < self.max_retries:
+                        self.concurrency.back_off(response, attempt)
+                        continue
+                    self.requests += 1
+                    if response.status >= 400:
+                        self.failures += 1
+                        response.raise_for_status()
+                    self.concurrency.increase()
+                    if self.cassette:
+                        self.cassette.record(method, f"{url}?{urlencode(params)}", body, response.status, response.headers, content)
+                    return json.loads(content) if content else None
+
+    async def list_sprints_async(self, board_id):
+        sprints = []
+        while True:
+            page = await self._request("GET", f"/rest/agile/1.0/board/{board_id}/sprint", {"startAt": len(sprints), "maxResults": SPRINT_PAGE_SIZE})
+            sprints.extend(page.get("values", []))
+            if page.get("isLast", True) or not page.get("values"):
+                return [to_resource(sprint) for sprint in sprints]
+
+    async def search_async(self, jql_query, fields, expand="changelog"):
+        params = {"jql": jql_query, "fields": fields, "expand": expand, "maxResults": self.page_size}
+        if self.is_cloud:
+            issues = []
+            next_page_token = None
+            while True:
+                page = await self._request("GET", "/rest/api/2/search/jql", {**params, "nextPageToken": next_page_token})
+                issues.extend(page.get("issues", []))
+                next_page_token = page.get("nextPageToken")
+                if not next_page_token:
+                    break
+            total = len(issues)
+        else:
+            first_page = await self._request("GET", "/rest/api/2/search", {**params, "startAt": 0})
+            issues = list(first_page.get("issues", []))
+            total = first_page.get("total", len(issues))
+            page_size, page_starts = remaining_page_starts(len(issues), total, self.page_size)
+            pages = await asyncio.gather(*(
+                self._request("GET", "/rest/api/2/search", {**params, "startAt": start_at, "maxResults": page_size})
+                for start_at in page_starts
+            ))
+            for page in pages:
+                issues.extend(page.get("issues", []))
+        return dedupe_search_results(issues, total, jql_query)
+
+    async def _fetch_worklogs(self, issue_id):
+        worklogs = []
+        while True:
+            page = await self._request("GET", f"/rest/api/2/issue/{issue_id}/worklog", {"startAt": len(worklogs)})
+            worklogs.extend(page.get("worklogs", []))
+            if not page.get("worklogs") or len(worklogs) >= page.get("total", 0):
+                return worklogs
+
+    async def backfill_worklogs_async(self, raw_issues):
+        truncated = truncated_worklog_issues(raw_issues)
+        if not truncated:
+            return 0
+        all_worklogs = await asyncio.gather(*(self._fetch_worklogs(raw["id"]) for raw in truncated))
+        for raw, worklogs in zip(truncated, all_worklogs):
+            set_complete_worklogs(raw, worklogs)
+        logging.info(f"Fetched complete worklogs for {len(truncated)} issues with more than one embedded page.")
+        return len(truncated)
+
+    async def _fetch_changelog_batch(self, issue_ids):
+        histories = {issue_id: [] for issue_id in issue_ids}
+        request = bulk_changelog_request(issue_ids)
+        while True:
+            response = await self._request("POST", "/rest/api/2/changelog/bulkfetch", json_body=request)
+            merge_bulk_changelogs(histories, response)
+            if not response.get("nextPageToken"):
+                return histories
+            request = {**request, "nextPageToken": response["nextPageToken"]}
+
+    async def backfill_changelogs_async(self, raw_issues, only_truncated=True):
+        targets = changelog_targets(raw_issues, only_truncated)
+        if not targets:
+            return 0
+        histories = {}
+        if self.is_cloud:
+            batches = id_batches(targets, self.changelog_batch_size)
+            for batch_histories in await asyncio.gather(*(self._fetch_changelog_batch(batch) for batch in batches)):
+                histories.update(batch_histories)
+        else:
+            batches = id_batches(targets)
+            for batch in await asyncio.gather(*(self.search_async(id_query(batch), "updated", "changelog") for batch in batches)):
+                histories.update((raw["id"], embedded_histories(raw)) for raw in batch)
+        set_complete_changelogs(targets, histories)
+        logging.info(f"Fetched complete changelogs for {len(targets)} issues in {len(batches)} batches.")
+        return len(targets)
+
+    def list_sprints(self, board_id):
+        return self._run(self.list_sprints_async(board_id))
+
+    def search(self, jql_query, fields, expand="changelog"):
+        return self._run(self.search_async(jql_query, fields, expand))
+
+    def backfill_worklogs(self, raw_issues):
+        return self._run(self.backfill_worklogs_async(raw_issues))
+
+    def backfill_changelogs(self, raw_issues, only_truncated=True):
+        return self._run(self.backfill_changelogs_async(raw_issues, only_truncated))
+
+    def requests_per_second(self):
+        elapsed = time.monotonic() - self._started_at
+        return self.requests / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        return {
+            "requests": self.requests, "throttled": self.concurrency.throttled, "retries": self.concurrency.retries, "failures": self.failures,
+            "requests_per_second": self.requests_per_second(), "concurrency_limit": self.concurrency.concurrency_limit,
+        }
+
+    def summary(self):
+        elapsed = time.monotonic() - self._started_at
+        return (
+            f"Jira requests (asyncio): {self.requests} in {elapsed:.1f}s ({self.requests / elapsed if elapsed > 0 else 0.0:.2f} req/s), "
+            f"{self.concurrency.throttled} throttled, {self.concurrency.retries} retries, {self.failures} failed, final concurrency limit {self.concurrency.concurrency_limit}."
+        )
@@ -0,0 +1,252 @@
+#
+# benchmark.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: Offline benchmarks for the computation in `jsonCreator.py`.
+#              Builds synthetic boards shaped like the jira resources that
+#              `process_sprint` reads, times the processing steps and JSON
+#              serialization across size tiers, reports throughput and peak
+#              memory, and saves or compares baselines. Scaling curves show
+#              when a step stops growing linearly with its input.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import argparse
+import gc
+import json
+import logging
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from fakeJiraServer import generate_board
+from issueStore import issue_from_raw, to_resource
+import jsonCreator
+
+# Fixed so every run benchmarks exactly the same board.
+BENCHMARK_TODAY = datetime(2025, 6, 4, 12, 0, tzinfo=timezone.utc)
+# name: (issues in the benchmarked sprint, histories per issue, worklogs per issue, sprints on the board)
+TIERS = {
+    "small": (50, 6, 8, 10),
+    "medium": (250, 12, 15, 25),
+    "large": (1000, 25, 25, 50),
+    "xlarge": (5000, 40, 40, 100),
+}
+SCALING_ISSUES = [250, 500, 1000, 2000, 4000, 8000]
+SCALING_SPRINTS = [10, 20, 40, 80, 160]
+# A doubling of the input should roughly double the time; a log-log slope above this is flagged.
+SUPERLINEAR_EXPONENT = 1.3
+REGRESSION_THRESHOLD = 0.10
+
+def synthetic_issues(board_issues):
+    issues = []
+    for issue in board_issues:
+        worklogs, histories = issue["worklogs"], issue["histories"]
+        issues.append(issue_from_raw({
+            "id": issue["id"], "key": issue["key"],
+            "fields": {**issue["fields"], "worklog": {"startAt": 0, "maxResults": len(worklogs), "total": len(worklogs), "worklogs": worklogs}},
+            "changelog": {"startAt": 0, "maxResults": len(histories), "total": len(histories), "histories": histories},
+        }))
+    return issues
+
+def sprint_workload(issue_count, histories, worklogs, seed=1):
+    # A three-sprint board whose first (closed) sprint holds all the benchmarked issues.
+    sprints, board_issues = generate_board(3, issue_count, histories, worklogs, carry_over=0, seed=seed, today=BENCHMARK_TODAY)
+    sprint = to_resource(sprints[0])
+    issues = synthetic_issues([issue for issue in board_issues if sprint.id in issue["sprint_ids"]])
+    start_date = jsonCreator.parse_jira_date(sprint.startDate).date()
+    end_date = jsonCreator.parse_jira_date(sprint.endDate).date()
+    date_range = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
+    return sprint, issues, date_range
+
+def board_workload(sprint_count, seed=1):
+    # All Time and JSON costs grow with sprints and days rather than issues, so keep the sprints light.
+    sprints, board_issues = generate_board(sprint_count, 20, 4, 4, seed=seed, today=BENCHMARK_TODAY)
+    issues_by_sprint = {}
+    for issue in synthetic_issues(board_issues):
+        for sprint_id in issue.raw["fields"][jsonCreator.SPRINT_FIELD_ID]:
+            issues_by_sprint.setdefault(sprint_id["id"], []).append(issue)
+    today = BENCHMARK_TODAY.date()
+    all_sprints_data, sprint_details = {}, []
+    for sprint in map(to_resource, sprints):
+        if sprint.state == "future":
+            continue
+        sprint_data_entry, details = jsonCreator.process_sprint(sprint, issues_by_sprint.get(sprint.id, []), today)
+        all_sprints_data[sprint.name] = sprint_data_entry
+        sprint_details.append(details)
+    return all_sprints_data, sprint_details
+
+def measure(fn, repeat, setup=None):
+    # Date parsing is cached across calls, so every timed run starts cold like a fresh refresh does.
+    timings = []
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        jsonCreator.parse_jira_date.cache_clear()
+        jsonCreator.parse_jira_day.cache_clear()
+        # Like timeit, keep collector pauses out of the timings.
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn(argument)
+            timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+
+    argument = setup() if setup else None
+    jsonCreator.parse_jira_date.cache_clear()
+    jsonCreator.parse_jira_day.cache_clear()
+    tracemalloc.start()
+    try:
+        fn(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"min_s": min(timings), "median_s": statistics.median(timings), "peak_mib": peak / 2 ** 20}
+
+def benchmark_tier(name, repeat):
+    issue_count, histories, worklogs, sprint_count = TIERS[name]
+    sprint, issues, date_range = sprint_workload(issue_count, histories, worklogs)
+    timelines = [jsonCreator.build_issue_timeline(issue) for issue in issues]
+    all_sprints_data, sprint_details = board_workload(sprint_count)
+    today = BENCHMARK_TODAY.date()
+    jsonCreator.create_all_time_and_ev_pv_views(all_sprints_data, sprint_details, today)
+    output = json.dumps(all_sprints_data, indent=4)
+    compact_output = jsonCreator.encode_json(all_sprints_data, compact=True)
+
+    cases = {
+        "process_sprint": (lambda _: jsonCreator.process_sprint(sprint, issues, today), None, len(issues), "issues"),
+        "daily_planned_points": (lambda _: jsonCreator.get_daily_planned_points_for_issues(timelines, date_range), None, len(timelines), "timelines"),
+        "all_time_views": (lambda data: jsonCreator.create_all_time_and_ev_pv_views(data, sprint_details, today), lambda: dict(all_sprints_data), len(sprint_details), "sprints"),
+        "json_dump": (lambda _: json.dumps(all_sprints_data, indent=4), None, len(output) / 2 ** 20, "MiB"),
+        "json_dump_compact": (lambda _: jsonCreator.encode_json(all_sprints_data, compact=True), None, len(compact_output) / 2 ** 20, "MiB"),
+    }
+    results = {}
+    for case, (fn, setup, units, unit_name) in cases.items():
+        result = measure(fn, repeat, setup)
+        result.update(units=units, unit=unit_name, throughput=units / result["median_s"] if result["median_s"] else float("inf"))
+        results[f"{name}/{case}"] = result
+    return results
+
+def scaling_curves(repeat):
+    curves = {"process_sprint": [], "daily_planned_points": [], "all_time_views": [], "json_dump": []}
+    today = BENCHMARK_TODAY.date()
+    for issue_count in SCALING_ISSUES:
+        sprint, issues, date_range = sprint_workload(issue_count, 12, 15)
+        timelines = [jsonCreator.build_issue_timeline(issue) for issue in issues]
+        curves["process_sprint"].append((issue_count, measure(lambda _: jsonCreator.process_sprint(sprint, issues, today), repeat)["median_s"]))
+        curves["daily_planned_points"].append((issue_count, measure(lambda _: jsonCreator.get_daily_planned_points_for_issues(timelines, date_range), repeat)["median_s"]))
+    for sprint_count in SCALING_SPRINTS:
+        all_sprints_data, sprint_details = board_workload(sprint_count)
+        curves["all_time_views"].append((sprint_count, measure(lambda data: jsonCreator.create_all_time_and_ev_pv_views(data, sprint_details, today), repeat, lambda: dict(all_sprints_data))["median_s"]))
+        jsonCreator.create_all_time_and_ev_pv_views(all_sprints_data, sprint_details, today)
+        curves["json_dump"].append((sprint_count, measure(lambda _: json.dumps(all_sprints_data, indent=4), repeat)["median_s"]))
+    return curves
+
+def scaling_exponent(points):
+    # Least-squares slope of log(time) against log(size): 1 is linear, 2 is quadratic.
+    logs = [(math.log(size), math.log(seconds)) for size, seconds in points if seconds > 0]
+    mean_x = sum(x for x, _ in logs) / len(logs)
+    mean_y = sum(y for _, y in logs) / len(logs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in logs) / sum((x - mean_x) ** 2 for x, _ in logs)
+
+def print_results(results):
+    print(f"{'benchmark':<32} {'median':>10} {'min':>10} {'throughput':>22} {'peak mem':>10}")
+    for name, result in results.items():
+        throughput = f"{result['throughput']:,.0f} {result['unit']}/s"
+        print(f"{name:<32} {result['median_s'] * 1000:>8.2f}ms {result['min_s'] * 1000:>8.2f}ms {throughput:>22} {result['peak_mib']:>7.2f}MiB")
+
+def print_scaling(curves):
+    flagged = []
+    for name, points in curves.items():
+        exponent = scaling_exponent(points)
+        marker = "  <-- superlinear" if exponent > SUPERLINEAR_EXPONENT else ""
+        print(f"\n{name} (time grows as n^{exponent:.2f}){marker}")
+        for size, seconds in points:
+            print(f"  n={size:<6} {seconds * 1000:>9.2f}ms  {seconds / size * 1e6:>8.2f}us per item")
+        if marker:
+            flagged.append(name)
+    if flagged:
+        print(f"\nPossible superlinear growth: {', '.join(flagged)}")
+
+def compare_to_baseline(results, baseline, threshold):
+    regressions = []
+    # Best-of-N runs are far less noisy than medians on a shared machine, so regressions are judged on them.
+    print(f"\n{'benchmark (best run)':<32} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            continue
+        change = result["min_s"] / previous["min_s"] - 1 if previous["min_s"] else 0.0
+        verdict = "slower" if change > threshold else "faster" if change < -threshold else ""
+        print(f"{name:<32} {previous['min_s'] * 1000:>8.2f}ms {result['min_s'] * 1000:>8.2f}ms {change:>+7.1%} {verdict}")
+        if verdict == "slower":
+            regressions.append(name)
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sprint processing in jsonCreator.py on synthetic data.")
+    parser.add_argument("--tiers", default="small,medium,large", help=f"Comma-separated size tiers to run, from {', '.join(TIERS)} (default: small,medium,large).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark; the median is reported (default: 5).")
+    parser.add_argument("--scaling", action="store_true", help="Also time each step over doubling input sizes and flag superlinear growth.")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results as a JSON baseline.")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a saved baseline and exit with status 1 on regressions.")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help=f"Relative slowdown of the best run counted as a regression (default: {REGRESSION_THRESHOLD}).")
+    args = parser.parse_args(argv)
+    args.tiers = [tier.strip() for tier in args.tiers.split(",") if tier.strip()]
+    unknown = [tier for tier in args.tiers if tier not in TIERS]
+    if unknown:
+        parser.error(f"unknown tier(s): {', '.join(unknown)}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    # process_sprint logs every sprint; keep the report readable.
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {}
+    for tier in args.tiers:
+        results.update(benchmark_tier(tier, args.repeat))
+    print_results(results)
+
+    report = {"created": datetime.now(timezone.utc).isoformat(), "python": platform.python_version(), "machine": platform.machine(), "results": results}
+    if args.scaling:
+        curves = scaling_curves(args.repeat)
+        print_scaling(curves)
+        report["scaling"] = {name: {"exponent": scaling_exponent(points), "points": [{"size": size, "median_s": seconds} for size, seconds in points]} for name, points in curves.items()}
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"\nSaved baseline to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#
+# cassette.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: Record and replay of Jira HTTP responses for `jsonCreator.py`.
+#              A record run saves every successful response to a gzip
+#              compressed cassette; a replay run serves them back from disk
+#              so the dashboard data can be rebuilt, profiled or benchmarked
+#              without a network or Jira credentials.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import gzip
+import json
+import logging
+import threading
+from collections import defaultdict
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_VERSION = 1
+# Bodies are stored decoded, so transfer headers from the live response no longer apply.
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+def request_key(method, url, body=None):
+    # Ignore the host and parameter order so a cassette replays against any JIRA_SERVER.
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    if body:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True)
+        except ValueError:
+            pass
+    return f"{method.upper()} {parts.path}?{query} {body or ''}"
+
+class Cassette:
+    def __init__(self, path, mode):
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._interactions = []
+        self._responses = defaultdict(list)
+        self._replayed = defaultdict(int)
+        if mode == "replay":
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                cassette = json.load(f)
+            if cassette.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Cassette {path} has version {cassette.get('version')}, expected {CASSETTE_VERSION}.")
+            for interaction in cassette["interactions"]:
+                self._responses[interaction["key"]].append(interaction)
+            logging.info(f"Replaying {len(cassette['interactions'])} recorded Jira responses from {path}.")
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def record(self, method, url, body, status, headers, content):
+        interaction = {
+            "key": request_key(method, url, body),
+            "status": status,
+            "headers": {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS},
+            "body": content.decode("utf-8"),
+        }
+        with self._lock:
+            self._interactions.append(interaction)
+
+    def replay(self, method, url, body=None):
+        key = request_key(method, url, body)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise LookupError(f"No recorded response in {self.path} for {key}. Record again with the same options.")
+            # Repeated identical requests get their responses in recorded order, then the last one again.
+            index = min(self._replayed[key], len(responses) - 1)
+            self._replayed[key] += 1
+        interaction = responses[index]
+        return interaction["status"], interaction["headers"], interaction["body"].encode("utf-8")
+
+    def save(self):
+        if self.replaying:
+            return
+        with self._lock:
+            interactions = list(self._interactions)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump({"version": CASSETTE_VERSION, "interactions": interactions}, f)
+        logging.info(f"Recorded {len(interactions)} Jira responses to {self.path}.")
+
+class CassetteAdapter(HTTPAdapter):
+    # Sits under jira-python's session: records what the real adapter returns, or answers from the cassette alone.
+    def __init__(self, cassette, adapter):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        if self.cassette.replaying:
+            status, headers, content = self.cassette.replay(request.method, request.url, request.body)
+            response = Response()
+            response.status_code = status
+            response.reason = HTTPStatus(status).phrase
+            response.headers = CaseInsensitiveDict(headers)
+            response._content = content
+            response.encoding = "utf-8"
+            response.url = request.url
+            response.request = request
+            return response
+
+        response = self.adapter.send(request, **kwargs)
+        # Throttled and failed responses are left out so a replay never waits or retries.
+        if response.status_code < 400:
+            self.cassette.record(request.method, request.url, request.body, response.status_code, response.headers, response.content)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+def install(cassette, session, adapter):
+    cassette_adapter = CassetteAdapter(cassette, adapter)
+    session.mount("https://", cassette_adapter)
+    session.mount("http://", cassette_adapter)
+    return cassette_adapter
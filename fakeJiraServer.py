@@ -0,0 +1,341 @@
+#
+# fakeJiraServer.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: Self-contained fake Jira for load-testing the fetch pipeline
+#              of `jsonCreator.py`. It serves a synthetic board (sprints,
+#              issues, changelog histories and worklogs) over the Agile
+#              sprint, search, worklog and changelog bulk endpoints, with
+#              configurable latency and throttling. Standard library only.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+STORY_POINTS_FIELD_ID = "customfield_10016"
+SPRINT_FIELD_ID = "customfield_10020"
+SPRINT_DAYS = 14
+MAX_SPRINT_PAGE = 50
+MAX_SEARCH_PAGE = 100
+# Search results embed only the first entries, like Jira does, so clients must backfill the rest.
+# Histories are only capped in Cloud mode: Server and Data Center embed them all and have no bulk changelog endpoint.
+EMBEDDED_WORKLOGS = 20
+EMBEDDED_HISTORIES = 100
+BULK_CHANGELOG_PAGE = 1000
+USERS = ["Alice Adams", "Bala Iyer", "Chen Wei", "Dana Cruz", "Emeka Obi", "Farah Khan"]
+STATUSES = ["To Do", "In Progress", "In Review", "Done"]
+STORY_POINTS = [1, 2, 3, 5, 8, 13]
+
+def format_jira_date(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}+0000"
+
+def generate_board(sprints=10, issues_per_sprint=50, histories_per_issue=6, worklogs_per_issue=8, carry_over=0.1, seed=1, today=None):
+    rng = random.Random(seed)
+    today = today or datetime.now(timezone.utc)
+    # The second-to-last sprint is active and the last one is in the future, as on a live board.
+    first_start = (today - timedelta(days=SPRINT_DAYS * (sprints - 2) + SPRINT_DAYS // 2)).replace(hour=9, minute=0, second=0, microsecond=0)
+    board_sprints = []
+    for index in range(sprints):
+        start = first_start + timedelta(days=SPRINT_DAYS * index)
+        end = start + timedelta(days=SPRINT_DAYS - 1, hours=8)
+        state = "future" if start > today else "active" if end > today else "closed"
+        sprint = {"id": 1000 + index, "name": f"Sprint {index + 1}", "state": state, "originBoardId": 1}
+        if state != "future":
+            sprint.update(startDate=format_jira_date(start), endDate=format_jira_date(end))
+        board_sprints.append(sprint)
+
+    issues = []
+    for index, sprint in enumerate(board_sprints):
+        if sprint["state"] == "future":
+            continue
+        start = first_start + timedelta(days=SPRINT_DAYS * index)
+        horizon = min(today, start + timedelta(days=SPRINT_DAYS))
+        for _ in range(issues_per_sprint):
+            issue_id = str(10000 + len(issues))
+            created = start - timedelta(days=rng.randint(0, 10), minutes=rng.randint(0, 600))
+            points = rng.choice(STORY_POINTS) if rng.random() < 0.8 else None
+            assignee = rng.choice(USERS) if rng.random() < 0.9 else None
+
+            histories, status = [], STATUSES[0]
+            moments = sorted(created + timedelta(minutes=rng.randint(0, int((horizon - created).total_seconds() // 60))) for _ in range(histories_per_issue))
+            for history_index, moment in enumerate(moments):
+                items = []
+                if rng.random() < 0.3:
+                    new_points = rng.choice(STORY_POINTS)
+                    items.append({"field": "Story Points", "fromString": None if points is None else str(points), "toString": str(new_points)})
+                    points = new_points
+                if rng.random() < 0.6 or not items:
+                    new_status = rng.choice([s for s in STATUSES if s != status])
+                    items.append({"field": "status", "fromString": status, "toString": new_status})
+                    status = new_status
+                histories.append({"id": f"{issue_id}{history_index:04d}", "created": moment, "items": items})
+
+            worklogs = [{
+                "id": f"{issue_id}{worklog_index:04d}",
+                "author": {"displayName": rng.choice(USERS)},
+                "started": format_jira_date(start + timedelta(minutes=rng.randint(0, int((horizon - start).total_seconds() // 60)))),
+                "timeSpentSeconds": rng.choice([900, 1800, 3600, 5400, 7200]),
+            } for worklog_index in range(worklogs_per_issue)]
+
+            sprint_refs = [{"id": sprint["id"], "name": sprint["name"], "state": sprint["state"]}]
+            if status != "Done" and index + 1 < len(board_sprints) and rng.random() < carry_over:
+                next_sprint = board_sprints[index + 1]
+                sprint_refs.append({"id": next_sprint["id"], "name": next_sprint["name"], "state": next_sprint["state"]})
+            updated = max([created] + [history["created"] for history in histories])
+            issues.append({
+                "id": issue_id,
+                "key": f"FAKE-{len(issues) + 1}",
+                "fields": {
+                    "summary": f"Synthetic issue {len(issues) + 1}",
+                    "assignee": {"displayName": assignee} if assignee else None,
+                    "status": {"name": status},
+                    STORY_POINTS_FIELD_ID: points,
+                    SPRINT_FIELD_ID: sprint_refs,
+                    "created": format_jira_date(created),
+                    "updated": format_jira_date(updated),
+                },
+                "histories": [{**history, "created": format_jira_date(history["created"])} for history in histories],
+                "worklogs": worklogs,
+                "sprint_ids": {ref["id"] for ref in sprint_refs},
+                "updated_at": updated,
+            })
+    return board_sprints, issues
+
+class FakeJira:
+    def __init__(self, sprints, issues, latency=0.0, jitter=0.0, rate_limit=None, burst=None, retry_after=1, cloud=False):
+        self.sprints = sprints
+        self.issues = issues
+        self.issues_by_id = {issue["id"]: issue for issue in issues}
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.burst = burst or (rate_limit or 1)
+        self.retry_after = retry_after
+        self.cloud = cloud
+        self.requests = Counter()
+        self.throttled = 0
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def admit(self):
+        # Token bucket: once it is empty the request is refused with 429 and a Retry-After hint.
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.throttled += 1
+            return False
+
+    def delay(self):
+        seconds = self.latency + random.uniform(0, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def match_issues(self, jql):
+        updated = re.search(r'\s+AND\s+updated\s*>=\s*"([^"]+)"', jql, re.IGNORECASE)
+        clause = jql[:updated.start()] if updated else jql
+        sprint_match = re.fullmatch(r"\s*Sprint\s*(?:=\s*(\d+)|in\s*\(([\d,\s]+)\))\s*", clause, re.IGNORECASE)
+        id_match = re.fullmatch(r"\s*id\s+in\s*\(([\d,\s]+)\)\s*", clause, re.IGNORECASE)
+        if sprint_match:
+            sprint_ids = {int(value) for value in re.findall(r"\d+", sprint_match.group(1) or sprint_match.group(2))}
+            matched = [issue for issue in self.issues if issue["sprint_ids"] & sprint_ids]
+        elif id_match:
+            issue_ids = set(re.findall(r"\d+", id_match.group(1)))
+            matched = [issue for issue in self.issues if issue["id"] in issue_ids]
+        else:
+            raise ValueError(f"Unsupported JQL: {jql}")
+        if updated:
+            since = datetime.strptime(updated.group(1), "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
+            matched = [issue for issue in matched if issue["updated_at"] >= since]
+        return matched
+
+    def render_issue(self, issue, fields, expand):
+        wanted = None if not fields or "*all" in fields else set(fields)
+        raw = {"id": issue["id"], "key": issue["key"], "fields": {name: value for name, value in issue["fields"].items() if wanted is None or name in wanted}}
+        if wanted is None or "worklog" in wanted:
+            worklogs = issue["worklogs"]
+            raw["fields"]["worklog"] = {"startAt": 0, "maxResults": EMBEDDED_WORKLOGS, "total": len(worklogs), "worklogs": worklogs[:EMBEDDED_WORKLOGS]}
+        if "changelog" in expand:
+            histories = issue["histories"] if not self.cloud else issue["histories"][:EMBEDDED_HISTORIES]
+            raw["changelog"] = {"startAt": 0, "maxResults": len(histories), "total": len(issue["histories"]), "histories": histories}
+        return raw
+
+    def sprint_page(self, params):
+        start_at = int(params.get("startAt", 0))
+        max_results = min(int(params.get("maxResults", MAX_SPRINT_PAGE)), MAX_SPRINT_PAGE)
+        values = self.sprints[start_at:start_at + max_results]
+        return {"maxResults": max_results, "startAt": start_at, "isLast": start_at + len(values) >= len(self.sprints), "values": values}
+
+    def search_page(self, params, token_paging):
+        matched = self.match_issues(params.get("jql", ""))
+        start_at = int(params.get("nextPageToken") or 0) if token_paging else int(params.get("startAt", 0))
+        max_results = min(int(params.get("maxResults", 50)), MAX_SEARCH_PAGE)
+        fields = [field for value in params.get("fields", "").split(",") for field in [value.strip()] if field]
+        expand = params.get("expand", "")
+        issues = [self.render_issue(issue, fields, expand) for issue in matched[start_at:start_at + max_results]]
+        if token_paging:
+            # Cloud's /search/jql has no total; clients follow nextPageToken until it disappears.
+            page = {"issues": issues, "isLast": start_at + max_results >= len(matched)}
+            if not page["isLast"]:
+                page["nextPageToken"] = str(start_at + max_results)
+            return page
+        return {"startAt": start_at, "maxResults": max_results, "total": len(matched), "issues": issues}
+
+    def worklog_page(self, issue_id, params):
+        worklogs = self.issues_by_id[issue_id]["worklogs"]
+        start_at = int(params.get("startAt", 0))
+        max_results = int(params.get("maxResults", 5000))
+        return {"startAt": start_at, "maxResults": max_results, "total": len(worklogs), "worklogs": worklogs[start_at:start_at + max_results]}
+
+    def bulk_changelogs(self, request):
+        entries = [(issue_id, history) for issue_id in request.get("issueIdsOrKeys", []) if issue_id in self.issues_by_id for history in self.issues_by_id[issue_id]["histories"]]
+        start_at = int(request.get("nextPageToken") or 0)
+        max_results = min(int(request.get("maxResults", BULK_CHANGELOG_PAGE)), BULK_CHANGELOG_PAGE)
+        page = entries[start_at:start_at + max_results]
+        changelogs = {}
+        for issue_id, history in page:
+            changelogs.setdefault(issue_id, []).append(history)
+        response = {"issueChangeLogs": [{"issueId": issue_id, "changeHistories": histories} for issue_id, histories in changelogs.items()]}
+        if start_at + max_results < len(entries):
+            response["nextPageToken"] = str(start_at + max_results)
+        return response
+
+    def handle(self, method, path, params, body):
+        if method == "GET" and path == "/rest/api/2/serverInfo":
+            return 200, {"baseUrl": "", "version": "9.12.0", "versionNumbers": [9, 12, 0], "deploymentType": "Cloud" if self.cloud else "Server"}
+        if method == "GET" and path == "/rest/api/2/field":
+            return 200, [
+                {"id": STORY_POINTS_FIELD_ID, "name": "Story Points", "custom": True, "clauseNames": ["Story Points", "cf[10016]"]},
+                {"id": SPRINT_FIELD_ID, "name": "Sprint", "custom": True, "clauseNames": ["Sprint", "cf[10020]"]},
+            ]
+        if method == "GET" and re.fullmatch(r"/rest/agile/1\.0/board/\d+/sprint", path):
+            return 200, self.sprint_page(params)
+        if method == "GET" and path == "/rest/api/2/search" and not self.cloud:
+            return 200, self.search_page(params, token_paging=False)
+        if method == "GET" and path == "/rest/api/2/search/jql" and self.cloud:
+            return 200, self.search_page(params, token_paging=True)
+        worklog_match = re.fullmatch(r"/rest/api/2/issue/(\d+)/worklog", path)
+        if method == "GET" and worklog_match and worklog_match.group(1) in self.issues_by_id:
+            return 200, self.worklog_page(worklog_match.group(1), params)
+        if method == "POST" and path == "/rest/api/2/changelog/bulkfetch" and self.cloud:
+            return 200, self.bulk_changelogs(json.loads(body or b"{}"))
+        return 404, {"errorMessages": [f"No fake endpoint for {method} {path}"]}
+
+    def summary(self):
+        endpoints = ", ".join(f"{endpoint}: {count}" for endpoint, count in self.requests.most_common())
+        return f"Served {sum(self.requests.values())} requests ({self.throttled} throttled). {endpoints}"
+
+def make_handler(fake):
+    class FakeJiraHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            logging.debug(format % args)
+
+        def respond(self, method):
+            url = urlsplit(self.path)
+            params = {name: ",".join(values) for name, values in parse_qs(url.query).items()}
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            # Normalise numeric ids so the per-endpoint counters stay readable.
+            endpoint = re.sub(r"/\d+", "/{id}", url.path)
+            fake.requests[f"{method} {endpoint}"] += 1
+            fake.delay()
+            if not fake.admit():
+                status, payload, headers = 429, {"errorMessages": ["Rate limit exceeded."]}, {"Retry-After": str(fake.retry_after)}
+            else:
+                try:
+                    status, payload = fake.handle(method, url.path, params, body)
+                except ValueError as e:
+                    status, payload = 400, {"errorMessages": [str(e)]}
+                headers = {}
+            content = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(content)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self):
+            self.respond("GET")
+
+        def do_POST(self):
+            self.respond("POST")
+
+    return FakeJiraHandler
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a synthetic Jira board for load-testing jsonCreator.py.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080).")
+    parser.add_argument("--sprints", type=int, default=10, help="Sprints on the board, including one active and one future sprint (default: 10).")
+    parser.add_argument("--issues-per-sprint", type=int, default=50, help="Issues created in each started sprint (default: 50).")
+    parser.add_argument("--histories", type=int, default=6, help="Changelog histories per issue (default: 6).")
+    parser.add_argument("--worklogs", type=int, default=8, help="Worklogs per issue (default: 8).")
+    parser.add_argument("--carry-over", type=float, default=0.1, help="Share of unfinished issues that also belong to the next sprint (default: 0.1).")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the synthetic data generator (default: 1).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response (default: 0).")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to this many seconds per response (default: 0).")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second served before answering 429 (default: unlimited).")
+    parser.add_argument("--burst", type=float, default=None, help="Requests allowed in a burst above --rate-limit (default: one second's worth).")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with a 429 (default: 1).")
+    parser.add_argument("--cloud", action="store_true", help="Behave like Jira Cloud: report a Cloud deployment, page searches through /search/jql tokens, cap embedded histories and serve the bulk changelog endpoint.")
+    args = parser.parse_args(argv)
+    if args.sprints < 2 or args.issues_per_sprint < 0 or args.histories < 0 or args.worklogs < 0:
+        parser.error("--sprints must be at least 2 and the per-issue counts must not be negative")
+    if not 0 <= args.carry_over <= 1:
+        parser.error("--carry-over must be between 0 and 1")
+    if args.latency < 0 or args.jitter < 0 or (args.rate_limit is not None and args.rate_limit <= 0):
+        parser.error("--latency and --jitter must not be negative and --rate-limit must be positive")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    sprints, issues = generate_board(args.sprints, args.issues_per_sprint, args.histories, args.worklogs, args.carry_over, args.seed)
+    fake = FakeJira(sprints, issues, args.latency, args.jitter, args.rate_limit, args.burst, args.retry_after, args.cloud)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(fake))
+    server.daemon_threads = True
+    logging.info(f"Fake Jira serving {len(sprints)} sprints and {len(issues)} issues on http://{args.host}:{server.server_port} (board 1).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logging.info(fake.summary())
+
+if __name__ == "__main__":
+    main()
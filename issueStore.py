@@ -0,0 +1,222 @@
+#
+# issueStore.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: Local SQLite store for raw Jira issues, their changelog
+#              histories and worklogs, so `jsonCreator.py` only has to
+#              download issues that changed since the previous run. It also
+#              keeps frozen results for closed sprints.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id TEXT PRIMARY KEY,
+    key TEXT,
+    updated TEXT,
+    fields TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS histories (
+    issue_id TEXT NOT NULL,
+    history_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    created TEXT,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (issue_id, history_id)
+);
+CREATE TABLE IF NOT EXISTS worklogs (
+    issue_id TEXT NOT NULL,
+    worklog_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    started TEXT,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (issue_id, worklog_id)
+);
+CREATE TABLE IF NOT EXISTS sprint_issues (
+    sprint_id INTEGER NOT NULL,
+    issue_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (sprint_id, issue_id)
+);
+CREATE TABLE IF NOT EXISTS sprint_sync (
+    sprint_id INTEGER PRIMARY KEY,
+    last_sync TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sprint_snapshots (
+    sprint_id INTEGER PRIMARY KEY,
+    input_hash TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+def to_resource(value):
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: to_resource(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [to_resource(v) for v in value]
+    return value
+
+def issue_from_raw(raw):
+    issue = to_resource(raw)
+    issue.raw = raw
+    return issue
+
+def normalize_history(history):
+    # The bulk changelog endpoint may report `created` as epoch milliseconds rather than a Jira timestamp string.
+    created = history.get("created")
+    if isinstance(created, (int, float)):
+        created_at = datetime.fromtimestamp(created / 1000, tz=timezone.utc)
+        history["created"] = created_at.strftime("%Y-%m-%dT%H:%M:%S.") + f"{created_at.microsecond // 1000:03d}+0000"
+    return history
+
+def _is_complete(container, entries):
+    return container.get("total", len(entries)) <= len(entries)
+
+class IssueStore:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def last_sync(self, sprint_id):
+        with self._lock:
+            row = self._conn.execute("SELECT last_sync FROM sprint_sync WHERE sprint_id = ?", (sprint_id,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def issue_versions(self, issue_ids):
+        versions = {}
+        with self._lock:
+            for i in range(0, len(issue_ids), 500):
+                batch = issue_ids[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                versions.update(self._conn.execute(f"SELECT id, updated FROM issues WHERE id IN ({placeholders})", batch).fetchall())
+        return versions
+
+    def merge_sprint_issues(self, sprint_id, raw_issues, synced_at, member_ids=None):
+        with self._lock, self._conn:
+            for raw in raw_issues:
+                self._merge_issue(raw)
+
+            if member_ids is not None:
+                placeholders = ",".join("?" * len(member_ids))
+                self._conn.execute(f"DELETE FROM sprint_issues WHERE sprint_id = ? AND issue_id NOT IN ({placeholders})", (sprint_id, *member_ids))
+            known_ids = {row[0] for row in self._conn.execute("SELECT issue_id FROM sprint_issues WHERE sprint_id = ?", (sprint_id,))}
+            next_seq = self._conn.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM sprint_issues WHERE sprint_id = ?", (sprint_id,)).fetchone()[0]
+            for issue_id in (member_ids if member_ids is not None else [raw["id"] for raw in raw_issues]):
+                if issue_id not in known_ids:
+                    self._conn.execute("INSERT INTO sprint_issues (sprint_id, issue_id, seq) VALUES (?, ?, ?)", (sprint_id, issue_id, next_seq))
+                    known_ids.add(issue_id)
+                    next_seq += 1
+
+            self._conn.execute("INSERT OR REPLACE INTO sprint_sync (sprint_id, last_sync) VALUES (?, ?)", (sprint_id, synced_at.isoformat()))
+
+    def _merge_issue(self, raw):
+        issue_id = raw["id"]
+        fields = dict(raw.get("fields", {}))
+        worklog = fields.pop("worklog", None)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO issues (id, key, updated, fields) VALUES (?, ?, ?, ?)",
+            (issue_id, raw.get("key"), fields.get("updated"), json.dumps(fields)),
+        )
+
+        # A complete list from Jira is authoritative; a truncated one can only add entries.
+        if worklog is not None:
+            entries = worklog.get("worklogs", [])
+            self._merge_entries("worklogs", "worklog_id", "started", issue_id, entries, _is_complete(worklog, entries))
+        changelog = raw.get("changelog")
+        if changelog is not None:
+            entries = changelog.get("histories", [])
+            self._merge_entries("histories", "history_id", "created", issue_id, entries, _is_complete(changelog, entries))
+
+    def _merge_entries(self, table, id_column, date_column, issue_id, entries, replace):
+        if replace:
+            self._conn.execute(f"DELETE FROM {table} WHERE issue_id = ?", (issue_id,))
+        next_seq = self._conn.execute(f"SELECT COALESCE(MAX(seq) + 1, 0) FROM {table} WHERE issue_id = ?", (issue_id,)).fetchone()[0]
+        for entry in entries:
+            existing = self._conn.execute(f"SELECT seq FROM {table} WHERE issue_id = ? AND {id_column} = ?", (issue_id, str(entry["id"]))).fetchone()
+            seq = existing[0] if existing else next_seq
+            if not existing:
+                next_seq += 1
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (issue_id, {id_column}, seq, {date_column}, raw) VALUES (?, ?, ?, ?, ?)",
+                (issue_id, str(entry["id"]), seq, entry.get(date_column), json.dumps(entry)),
+            )
+
+    def load_sprint_issues(self, sprint_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT i.id, i.key, i.fields FROM sprint_issues s JOIN issues i ON i.id = s.issue_id WHERE s.sprint_id = ? ORDER BY s.seq",
+                (sprint_id,),
+            ).fetchall()
+            issue_ids = [row[0] for row in rows]
+            worklogs = self._load_entries("worklogs", issue_ids)
+            histories = self._load_entries("histories", issue_ids)
+
+        raw_issues = []
+        for issue_id, key, fields_json in rows:
+            fields = json.loads(fields_json)
+            issue_worklogs = worklogs.get(issue_id, [])
+            issue_histories = histories.get(issue_id, [])
+            fields["worklog"] = {"startAt": 0, "maxResults": len(issue_worklogs), "total": len(issue_worklogs), "worklogs": issue_worklogs}
+            raw_issues.append({
+                "id": issue_id, "key": key, "fields": fields,
+                "changelog": {"startAt": 0, "maxResults": len(issue_histories), "total": len(issue_histories), "histories": issue_histories},
+            })
+        return raw_issues
+
+    def sprint_input_hash(self, sprint_id, extra_inputs):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT i.id, i.updated FROM sprint_issues s JOIN issues i ON i.id = s.issue_id WHERE s.sprint_id = ? ORDER BY s.seq",
+                (sprint_id,),
+            ).fetchall()
+        content = json.dumps({"inputs": extra_inputs, "issues": rows}, sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def load_snapshot(self, sprint_id, input_hash):
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM sprint_snapshots WHERE sprint_id = ? AND input_hash = ?", (sprint_id, input_hash)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_snapshot(self, sprint_id, input_hash, payload):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sprint_snapshots (sprint_id, input_hash, payload) VALUES (?, ?, ?)",
+                (sprint_id, input_hash, json.dumps(payload)),
+            )
+
+    def _load_entries(self, table, issue_ids):
+        entries = {}
+        if not issue_ids:
+            return entries
+        placeholders = ",".join("?" * len(issue_ids))
+        for issue_id, raw in self._conn.execute(f"SELECT issue_id, raw FROM {table} WHERE issue_id IN ({placeholders}) ORDER BY issue_id, seq", issue_ids):
+            entries.setdefault(issue_id, []).append(json.loads(raw))
+        return entries
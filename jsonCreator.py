@@ -22,13 +22,43 @@
 # limitations under the License.
 #
 
+import argparse
+import gzip
+import hashlib
 import json
 import logging
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from jira import JIRA
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from datetime import datetime, timedelta, timezone
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from dotenv import load_dotenv
+from issueStore import IssueStore, issue_from_raw
+from rawIssues import bulk_changelog_request, changelog_targets, dedupe_search_results, embedded_histories, id_batches, id_query, merge_bulk_changelogs, remaining_page_starts, set_complete_changelogs, set_complete_worklogs, truncated_worklog_issues
+from asyncFetcher import AsyncJiraFetcher
+from cassette import Cassette, install as install_cassette
+from requestScheduler import RequestScheduler
+from runReport import run_report
+from metricsExporter import render_openmetrics, write_textfile
+from profiler import PROFILE_MODES, PROFILE_TOP, Profiler
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
 
 load_dotenv()
 
@@ -38,7 +68,34 @@ JIRA_SERVER = os.getenv("JIRA_SERVER")
 JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 API_TOKEN = os.getenv("API_TOKEN")
 STORY_POINTS_FIELD_ID = "customfield_10016"
+SPRINT_FIELD_ID = "customfield_10020"
 BOARD_ID = 1
+ISSUE_FIELDS = f"assignee,summary,worklog,{STORY_POINTS_FIELD_ID},status,changelog,created,updated"
+LEAN_ISSUE_FIELDS = f"assignee,status,created,updated,{STORY_POINTS_FIELD_ID}"
+SEARCH_PAGE_SIZE = 100
+FETCH_WORKERS = 8
+SPRINT_WORKERS = 4
+CHANGELOG_BATCH_SIZE = 1000
+DATE_CACHE_SIZE = 65536
+REQUESTS_PER_SECOND = 10.0
+MAX_CONCURRENT_REQUESTS = 8
+HTTP_POOL_SIZE = 16
+HTTP_TIMEOUT = 60.0
+ISSUE_STORE_PATH = os.getenv("ISSUE_STORE_PATH", "jira_store.sqlite3")
+REPLAY_SERVER = "https://jira.replay.invalid"
+RUN_REPORT_PATH = "run_report.json"
+METRICS_PATH = os.getenv("METRICS_PATH", "jira_refresh.prom")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+SHARD_DIR = os.getenv("SHARD_DIR", "data")
+SHARD_VIEWS = {"All Time": "all-time.json", "EV/PV": "ev-pv.json"}
+PRECOMPRESSED_SUFFIXES = (".gz", ".br")
+# JQL compares `updated` in the Jira user's timezone, so re-read a day of overlap to cover any offset.
+SYNC_OVERLAP = timedelta(days=1)
+# Bump whenever process_sprint output changes so stale closed-sprint snapshots are rebuilt.
+SNAPSHOT_VERSION = 2
+
+# Changelog events of one issue in history order, with days parsed once (as date ordinals) for every consumer.
+IssueTimeline = namedtuple("IssueTimeline", ["story_points", "status_changes", "point_changes"])
 
 def validate_config():
     if not all([JIRA_SERVER, JIRA_EMAIL, API_TOKEN]):
@@ -46,9 +103,30 @@ def validate_config():
         logging.error("Please ensure you have a .env file in the script's directory with the required credentials.")
         exit(1)
 
+def parse_canonical_jira_date(date_str):
+    # Fixed-layout fast path for Jira's usual "2025-05-19T14:03:27.123+0530"; anything else returns None.
+    if len(date_str) != 28 or date_str[10] != "T" or date_str[19] != "." or date_str[23] not in "+-":
+        return None
+    digits = date_str[0:4] + date_str[5:7] + date_str[8:10] + date_str[11:13] + date_str[14:16] + date_str[17:19] + date_str[20:23] + date_str[24:28]
+    if date_str[4] + date_str[7] + date_str[13] + date_str[16] != "--::" or not (digits.isascii() and digits.isdigit()):
+        return None
+    offset_hours, offset_minutes = int(date_str[24:26]), int(date_str[26:28])
+    if offset_hours > 23 or offset_minutes > 59:
+        return None
+    try:
+        parsed = datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]), int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]), int(date_str[20:23]) * 1000, tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    offset = timedelta(hours=offset_hours, minutes=offset_minutes)
+    return parsed - offset if date_str[23] == "+" else parsed + offset
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
 def parse_jira_date(date_str):
     if not date_str:
         return None
+    parsed = parse_canonical_jira_date(date_str)
+    if parsed:
+        return parsed
     if len(date_str) > 5 and date_str[-5] in ("+", "-") and date_str[-3] != ":":
         date_str = date_str[:-2] + ":" + date_str[-2:]
     try:
@@ -57,29 +135,279 @@ def parse_jira_date(date_str):
         logging.warning(f"Could not parse date: {date_str}")
         return None
 
-def get_daily_planned_points_for_issues(issues, date_range):
-    daily_planned_points = {day: 0 for day in date_range}
-    for issue in issues:
-        initial_story_points = getattr(issue.fields, STORY_POINTS_FIELD_ID, 0) or 0
-        if initial_story_points > 0:
-            for day in date_range:
-                daily_planned_points[day] += initial_story_points
-        for h in sorted(issue.changelog.histories, key=lambda h: h.created):
-            parsed_history_date = parse_jira_date(h.created)
-            if not parsed_history_date:
-                continue
-            history_date = parsed_history_date.date()
-            for item in h.items:
-                if item.field == "Story Points":
-                    from_points = float(item.fromString or 0)
-                    to_points = float(item.toString or 0)
-                    point_change = to_points - from_points
-                    for day in date_range:
-                        if day >= history_date:
-                            daily_planned_points[day] += point_change
-    return [daily_planned_points.get(d, 0) for d in date_range]
-
-def process_sprint(sprint, jira_client, today):
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_jira_day(date_str):
+    parsed = parse_jira_date(date_str)
+    return parsed.toordinal() if parsed else None
+
+def search_all_issues(jira_client, jql_query, fields=ISSUE_FIELDS, expand="changelog", page_size=SEARCH_PAGE_SIZE, max_workers=FETCH_WORKERS):
+    if getattr(jira_client, "_is_cloud", False):
+        # Jira Cloud only serves token-chained /search/jql pages: there is no total and pages must be read in sequence.
+        issues = list(jira_client.enhanced_search_issues(jql_query, maxResults=False, fields=fields, expand=expand))
+        total = len(issues)
+        page_starts = range(0)
+    else:
+        first_page = jira_client.search_issues(jql_query, startAt=0, maxResults=page_size, fields=fields, expand=expand)
+        issues = list(first_page)
+        total = getattr(first_page, "total", len(issues))
+        page_size, page_starts = remaining_page_starts(len(issues), total, page_size)
+    if page_starts:
+        fetch_page = lambda start_at: jira_client.search_issues(jql_query, startAt=start_at, maxResults=page_size, fields=fields, expand=expand)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for page in executor.map(fetch_page, page_starts):
+                issues.extend(page)
+    return dedupe_search_results(issues, total, jql_query, issue_id=lambda issue: issue.id)
+
+def fetch_worklogs(jira_client, issue_id):
+    # jira_client.worklogs() reads a single page, so follow startAt until the reported total.
+    worklogs = []
+    while True:
+        page = jira_client._get_json(f"issue/{issue_id}/worklog", params={"startAt": len(worklogs)})
+        worklogs.extend(page.get("worklogs", []))
+        if not page.get("worklogs") or len(worklogs) >= page.get("total", 0):
+            return worklogs
+
+def backfill_worklogs(jira_client, raw_issues, max_workers=FETCH_WORKERS):
+    truncated = truncated_worklog_issues(raw_issues)
+    if not truncated:
+        return 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for raw, worklogs in zip(truncated, executor.map(lambda raw: fetch_worklogs(jira_client, raw["id"]), truncated)):
+            set_complete_worklogs(raw, worklogs)
+    logging.info(f"Fetched complete worklogs for {len(truncated)} issues with more than one embedded page.")
+    return len(truncated)
+
+def fetch_changelog_batch(jira_client, issue_ids):
+    histories = {issue_id: [] for issue_id in issue_ids}
+    request = bulk_changelog_request(issue_ids)
+    while True:
+        response = jira_client._session.post(jira_client._get_url("changelog/bulkfetch"), data=json.dumps(request)).json()
+        merge_bulk_changelogs(histories, response)
+        if not response.get("nextPageToken"):
+            return histories
+        request["nextPageToken"] = response["nextPageToken"]
+
+def backfill_changelogs(jira_client, raw_issues, only_truncated=True, max_workers=FETCH_WORKERS):
+    # `expand=changelog` caps the histories per issue; pull complete histories in batches through the bulk endpoint.
+    targets = changelog_targets(raw_issues, only_truncated)
+    if not targets:
+        return 0
+    histories = {}
+    if getattr(jira_client, "_is_cloud", False):
+        batches = id_batches(targets, CHANGELOG_BATCH_SIZE)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch_histories in executor.map(lambda batch: fetch_changelog_batch(jira_client, batch), batches):
+                histories.update(batch_histories)
+    else:
+        # Server and Data Center have no bulk changelog endpoint, but their searches embed complete histories.
+        batches = id_batches(targets)
+        fetch_batch = lambda batch: search_all_issues(jira_client, id_query(batch), fields="updated", expand="changelog")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch in executor.map(fetch_batch, batches):
+                histories.update((issue.raw["id"], embedded_histories(issue.raw)) for issue in batch)
+    set_complete_changelogs(targets, histories)
+    logging.info(f"Fetched complete changelogs for {len(targets)} issues in {len(batches)} batches.")
+    return len(targets)
+
+class JiraFetcher:
+    # Thread-pool backend over the synchronous jira client; AsyncJiraFetcher offers the same methods over asyncio.
+    def __init__(self, jira_client, scheduler):
+        self.jira_client = jira_client
+        self.scheduler = scheduler
+
+    @property
+    def is_cloud(self):
+        return getattr(self.jira_client, "_is_cloud", False)
+
+    def list_sprints(self, board_id):
+        # maxResults=False pages through every sprint; the default stops after the first 50.
+        return self.jira_client.sprints(board_id=board_id, maxResults=False)
+
+    def search(self, jql_query, fields=ISSUE_FIELDS, expand="changelog"):
+        return [issue.raw for issue in search_all_issues(self.jira_client, jql_query, fields=fields, expand=expand)]
+
+    def backfill_worklogs(self, raw_issues):
+        return backfill_worklogs(self.jira_client, raw_issues)
+
+    def backfill_changelogs(self, raw_issues, only_truncated=True):
+        return backfill_changelogs(self.jira_client, raw_issues, only_truncated)
+
+    def stats(self):
+        return self.scheduler.stats()
+
+    def summary(self):
+        return self.scheduler.summary()
+
+    def close(self):
+        self.jira_client.close()
+
+def fetch_issues(fetcher, jql_query, fields=ISSUE_FIELDS, expand_changelog=True):
+    # Without expansion every returned issue takes its changelog from the bulk endpoint instead of the search payload.
+    raw_issues = fetcher.search(jql_query, fields=fields, expand="changelog" if expand_changelog else None)
+    fetcher.backfill_worklogs(raw_issues)
+    fetcher.backfill_changelogs(raw_issues, only_truncated=expand_changelog)
+    return raw_issues
+
+def sprint_group_query(sprints):
+    if len(sprints) == 1:
+        return f"Sprint = {sprints[0].id}"
+    return f"Sprint in ({', '.join(str(sprint.id) for sprint in sprints)})"
+
+def sprint_group_fields(fields, sprints):
+    # A multi-sprint search needs the sprint field to split its issues back up locally.
+    return fields if len(sprints) == 1 else f"{fields},{SPRINT_FIELD_ID}"
+
+def issue_sprint_ids(raw):
+    sprint_ids = set()
+    for value in raw["fields"].get(SPRINT_FIELD_ID) or []:
+        if isinstance(value, dict):
+            sprint_ids.add(value.get("id"))
+        else:
+            # Jira Server reports sprints as "com.atlassian.greenhopper.service.sprint.Sprint@...[id=12,...]" strings.
+            match = re.search(r"\bid=(\d+)", str(value))
+            if match:
+                sprint_ids.add(int(match.group(1)))
+    return sprint_ids
+
+def partition_issues_by_sprint(raw_issues, sprints):
+    if len(sprints) == 1:
+        return {sprints[0].id: list(raw_issues)}
+    issues_by_sprint = {sprint.id: [] for sprint in sprints}
+    for raw in raw_issues:
+        for sprint_id in issue_sprint_ids(raw):
+            if sprint_id in issues_by_sprint:
+                issues_by_sprint[sprint_id].append(raw)
+    return issues_by_sprint
+
+def fetch_sprint_group_issues(fetcher, sprints):
+    raw_issues = fetch_issues(fetcher, sprint_group_query(sprints), fields=sprint_group_fields(ISSUE_FIELDS, sprints))
+    return {sprint_id: [issue_from_raw(raw) for raw in sprint_raws] for sprint_id, sprint_raws in partition_issues_by_sprint(raw_issues, sprints).items()}
+
+def fetch_changed_issues_two_phase(fetcher, store, jql_query, lean_fields=LEAN_ISSUE_FIELDS, full_sync=False, max_workers=FETCH_WORKERS):
+    # Phase 1 lists every issue with only the fields the charts need, so changes are found without downloading histories.
+    lean_issues = fetcher.search(jql_query, fields=lean_fields, expand=None)
+    stored_versions = {} if full_sync else store.issue_versions([raw["id"] for raw in lean_issues])
+    changed_issues = [raw for raw in lean_issues if stored_versions.get(raw["id"]) != raw["fields"].get("updated")]
+
+    # Phase 2 fetches worklogs for the changed issues, and changelogs only for the ones that carry story points.
+    fetch_worklog_batch = lambda ids: fetcher.search(id_query(ids), fields="worklog", expand=None)
+    worklogs_by_id = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch in executor.map(fetch_worklog_batch, id_batches(changed_issues)):
+            worklogs_by_id.update((raw["id"], raw["fields"].get("worklog")) for raw in batch)
+    for raw in changed_issues:
+        raw["fields"]["worklog"] = worklogs_by_id.get(raw["id"]) or {"startAt": 0, "maxResults": 0, "total": 0, "worklogs": []}
+    fetcher.backfill_worklogs(changed_issues)
+
+    pointed_issues = [raw for raw in changed_issues if raw["fields"].get(STORY_POINTS_FIELD_ID)]
+    # Issues without points keep no changelog, so the store leaves the histories it already holds for them alone.
+    fetcher.backfill_changelogs(pointed_issues, only_truncated=False)
+    return changed_issues, lean_issues
+
+def sync_sprint_issues(fetcher, store, sprints, full_sync=False, two_phase=False):
+    synced_at = datetime.now(timezone.utc)
+    last_syncs = [None if full_sync else store.last_sync(sprint.id) for sprint in sprints]
+    jql_query = sprint_group_query(sprints)
+    members_by_sprint = {sprint.id: None for sprint in sprints}
+
+    if two_phase:
+        sync_mode = "two-phase"
+        changed_issues, lean_issues = fetch_changed_issues_two_phase(fetcher, store, jql_query, sprint_group_fields(LEAN_ISSUE_FIELDS, sprints), full_sync)
+        members_by_sprint = {sprint_id: [raw["id"] for raw in sprint_raws] for sprint_id, sprint_raws in partition_issues_by_sprint(lean_issues, sprints).items()}
+    elif None in last_syncs:
+        sync_mode = "full"
+        changed_issues = fetch_issues(fetcher, jql_query, fields=sprint_group_fields(ISSUE_FIELDS, sprints))
+        members_by_sprint = {sprint_id: [raw["id"] for raw in sprint_raws] for sprint_id, sprint_raws in partition_issues_by_sprint(changed_issues, sprints).items()}
+    else:
+        sync_mode = "incremental"
+        since = (min(last_syncs) - SYNC_OVERLAP).strftime("%Y-%m-%d %H:%M")
+        # On Cloud, keep the search lean and bulk-fetch changelogs; Server and Data Center embed complete histories and have no bulk endpoint.
+        changed_issues = fetch_issues(fetcher, f'{jql_query} AND updated >= "{since}"', fields=sprint_group_fields(ISSUE_FIELDS, sprints), expand_changelog=not fetcher.is_cloud)
+        # Issues can still leave an active sprint, which an `updated` query can't see.
+        for sprint in sprints:
+            if sprint.state == "active":
+                members_by_sprint[sprint.id] = [raw["id"] for raw in fetcher.search(f"Sprint = {sprint.id}", fields="updated", expand=None)]
+
+    sprint_issues = {}
+    changed_by_sprint = partition_issues_by_sprint(changed_issues, sprints)
+    for sprint in sprints:
+        changed_sprint_issues = changed_by_sprint[sprint.id]
+        logging.info(f"Synced {len(changed_sprint_issues)} changed issues for sprint {sprint.name} ({sync_mode}).")
+        store.merge_sprint_issues(sprint.id, changed_sprint_issues, synced_at, members_by_sprint[sprint.id])
+        sprint_issues[sprint.id] = [issue_from_raw(raw) for raw in store.load_sprint_issues(sprint.id)]
+        run_report.count("store_issues_loaded", len(sprint_issues[sprint.id]))
+        run_report.count("store_issues_changed", len(changed_sprint_issues))
+    return sprint_issues
+
+def is_exactly_summable(values):
+    # Multiples of 1/1024 whose magnitudes stay under 2**42 add without rounding in any order.
+    total_magnitude = 0
+    for value in values:
+        try:
+            numerator, denominator = float(value).as_integer_ratio()
+        except (OverflowError, ValueError):
+            return False
+        if denominator > 1024:
+            return False
+        total_magnitude += abs(value)
+    return total_magnitude < 2 ** 42
+
+def build_issue_timeline(issue):
+    status_changes, point_changes = [], []
+    for h in sorted(issue.changelog.histories, key=lambda h: h.created):
+        history_day = parse_jira_day(h.created)
+        if history_day is None:
+            continue
+        for item in h.items:
+            if item.field == "status":
+                status_changes.append((history_day, item.fromString, item.toString))
+            elif item.field == "Story Points":
+                from_points = float(item.fromString or 0)
+                to_points = float(item.toString or 0)
+                point_changes.append((history_day, to_points - from_points))
+    story_points = getattr(issue.fields, STORY_POINTS_FIELD_ID, 0) or 0
+    return IssueTimeline(story_points, tuple(status_changes), tuple(point_changes))
+
+@run_report.timed("get_daily_planned_points_for_issues")
+def get_daily_planned_points_for_issues(timelines, date_range):
+    # Each estimate contributes from its day offset onwards, so the series is a prefix sum of per-day deltas.
+    point_changes = []
+    for timeline in timelines:
+        if timeline.story_points > 0:
+            point_changes.append((0, timeline.story_points))
+        for history_day, change in timeline.point_changes:
+            day_offset = max(history_day - date_range[0].toordinal(), 0) if date_range else 0
+            point_changes.append((day_offset, change))
+
+    daily_planned_points = [0] * len(date_range)
+    if is_exactly_summable(change for _, change in point_changes):
+        daily_deltas = [0] * len(date_range)
+        for day_offset, change in point_changes:
+            if day_offset < len(date_range):
+                daily_deltas[day_offset] += change
+        running_total = 0
+        for day_offset, delta in enumerate(daily_deltas):
+            running_total += delta
+            daily_planned_points[day_offset] = running_total
+    else:
+        # Inexact estimates (e.g. 0.3) keep the original per-day summation order so the output is unchanged.
+        for day_offset, change in point_changes:
+            for i in range(day_offset, len(date_range)):
+                daily_planned_points[i] += change
+    return daily_planned_points
+
+def build_cumulative_series(daily_values, visible_days):
+    # Each day builds on the previous rounded total, matching what the dashboard has always shown.
+    series = []
+    running_total = 0
+    for value in daily_values[:visible_days]:
+        running_total = round(running_total + value, 2)
+        series.append(running_total)
+    series.extend([None] * (len(daily_values) - visible_days))
+    return series
+
+@run_report.timed("process_sprint")
+def process_sprint(sprint, sprint_issues, today):
     sprint_name = sprint.name
     logging.info(f"--- Processing sprint: {sprint_name} (ID: {sprint.id}, State: {sprint.state}) ---")
 
@@ -94,21 +422,33 @@ def process_sprint(sprint, jira_client, today):
     end_date = parsed_end_date.date()
     date_range = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
 
-    jql_query = f"Sprint = {sprint.id}"
-    sprint_issues = jira_client.search_issues(
-        jql_query, maxResults=200, fields=f"assignee,summary,worklog,{STORY_POINTS_FIELD_ID},status,changelog,created", expand="changelog"
-    )
-
     planned_hours = {"overall": 0}
     user_list = set()
-    issues_by_user = defaultdict(list)
-    daily_data = {day: {"points": 0, "hours": 0, "users": defaultdict(lambda: {"points": 0, "hours": 0})} for day in date_range}
+    timelines_by_user = defaultdict(list)
+    sprint_timelines = []
+
+    # Dense per-day arrays indexed by day offset from the sprint start, with one row per user.
+    # Cells stay plain Python numbers so untouched days keep serializing as 0 rather than 0.0.
+    start_day = start_date.toordinal()
+    sprint_length = len(date_range)
+    daily_points, daily_hours = [0] * sprint_length, [0] * sprint_length
+    user_rows = {}
+    user_points, user_hours = [], []
+
+    def user_row(user):
+        if user not in user_rows:
+            user_rows[user] = len(user_points)
+            user_points.append([0] * sprint_length)
+            user_hours.append([0] * sprint_length)
+        return user_rows[user]
 
     for issue in sprint_issues:
         user_name = getattr(getattr(issue.fields, "assignee", None), "displayName", "Unassigned")
         user_list.add(user_name)
-        issues_by_user[user_name].append(issue)
-        story_points = getattr(issue.fields, STORY_POINTS_FIELD_ID, 0) or 0
+        timeline = build_issue_timeline(issue)
+        sprint_timelines.append(timeline)
+        timelines_by_user[user_name].append(timeline)
+        story_points = timeline.story_points
 
         if story_points:
             planned_hours["overall"] += story_points
@@ -117,78 +457,92 @@ def process_sprint(sprint, jira_client, today):
 
         if hasattr(issue.fields, "worklog"):
             for worklog in issue.fields.worklog.worklogs:
-                parsed_date = parse_jira_date(worklog.started)
-                if parsed_date:
-                    log_date = parsed_date.date()
-                    if log_date in daily_data:
-                        author = getattr(worklog.author, "displayName", "Unassigned")
-                        user_list.add(author)
-                        hours = getattr(worklog, "timeSpentSeconds", 0) / 3600
-                        daily_data[log_date]["hours"] += hours
-                        daily_data[log_date]["users"][author]["hours"] += hours
+                log_day = parse_jira_day(worklog.started)
+                if log_day is not None and 0 <= log_day - start_day < sprint_length:
+                    log_offset = log_day - start_day
+                    author = getattr(worklog.author, "displayName", "Unassigned")
+                    user_list.add(author)
+                    hours = getattr(worklog, "timeSpentSeconds", 0) / 3600
+                    daily_hours[log_offset] += hours
+                    user_hours[user_row(author)][log_offset] += hours
         
         if not story_points:
             continue
 
-        last_todo_exit_date, last_done_date = None, None
-        for h in sorted(issue.changelog.histories, key=lambda h: h.created):
-            parsed_history_date = parse_jira_date(h.created)
-            if parsed_history_date:
-                history_date = parsed_history_date.date()
-                for item in h.items:
-                    if item.field == "status":
-                        if item.fromString == "To Do": last_todo_exit_date = history_date
-                        if item.toString == "Done": last_done_date = history_date
+        last_todo_exit_day, last_done_day = None, None
+        for history_day, from_status, to_status in timeline.status_changes:
+            if from_status == "To Do": last_todo_exit_day = history_day
+            if to_status == "Done": last_done_day = history_day
         
-        final_half_credit_date = None
+        half_credit_offset = None
         if issue.fields.status.name != "To Do":
-            if last_todo_exit_date:
-                final_half_credit_date = start_date if last_todo_exit_date < start_date else last_todo_exit_date
-            else:
-                parsed_creation_date = parse_jira_date(issue.fields.created)
-                if parsed_creation_date:
-                    creation_date = parsed_creation_date.date()
-                    final_half_credit_date = start_date if creation_date < start_date else creation_date
+            half_credit_day = last_todo_exit_day if last_todo_exit_day else parse_jira_day(issue.fields.created)
+            if half_credit_day is not None:
+                half_credit_offset = max(half_credit_day - start_day, 0)
 
-        final_done_credit_date = last_done_date if last_done_date and last_done_date >= start_date else None
+        done_credit_offset = last_done_day - start_day if last_done_day and last_done_day >= start_day else None
         
-        if final_half_credit_date and final_half_credit_date in daily_data:
-            if not (final_done_credit_date and final_half_credit_date > final_done_credit_date):
-                daily_data[final_half_credit_date]["points"] += story_points / 2
-                daily_data[final_half_credit_date]["users"][user_name]["points"] += (story_points / 2)
+        if half_credit_offset is not None and half_credit_offset < sprint_length:
+            if not (done_credit_offset is not None and half_credit_offset > done_credit_offset):
+                daily_points[half_credit_offset] += story_points / 2
+                user_points[user_row(user_name)][half_credit_offset] += (story_points / 2)
         
-        if final_done_credit_date and final_done_credit_date in daily_data:
-            daily_data[final_done_credit_date]["points"] += story_points / 2
-            daily_data[final_done_credit_date]["users"][user_name]["points"] += (story_points / 2)
+        if done_credit_offset is not None and done_credit_offset < sprint_length:
+            daily_points[done_credit_offset] += story_points / 2
+            user_points[user_row(user_name)][done_credit_offset] += (story_points / 2)
 
     sprint_users = sorted(list(user_list))
     sprint_data_entry = {"users": sprint_users, "dates": [d.strftime("%Y-%m-%d") for d in date_range], "plannedHours": planned_hours, "charts": {"overall": {"earnedHours": [], "actualCost": []}}}
-    sprint_data_entry["charts"]["overall"]["dailyPlannedHours"] = get_daily_planned_points_for_issues(sprint_issues, date_range)
+    sprint_data_entry["charts"]["overall"]["dailyPlannedHours"] = get_daily_planned_points_for_issues(sprint_timelines, date_range)
     
     for user in sprint_users:
         sprint_data_entry["charts"][user] = {"earnedHours": [], "actualCost": []}
-        user_issues = issues_by_user.get(user, [])
-        sprint_data_entry["charts"][user]["dailyPlannedHours"] = get_daily_planned_points_for_issues(user_issues, date_range)
+        user_timelines = timelines_by_user.get(user, [])
+        sprint_data_entry["charts"][user]["dailyPlannedHours"] = get_daily_planned_points_for_issues(user_timelines, date_range)
 
-    for day in date_range:
-        is_future_date = sprint.state == "active" and day > today
-        get_last_value = lambda arr: next((item for item in reversed(arr) if item is not None), 0)
+    # Only an active sprint has future days, and those always form the tail of the range.
+    visible_days = min(max((today - start_date).days + 1, 0), sprint_length) if sprint.state == "active" else sprint_length
+    overall_chart = sprint_data_entry["charts"]["overall"]
+    overall_chart["earnedHours"] = build_cumulative_series(daily_points, visible_days)
+    overall_chart["actualCost"] = build_cumulative_series(daily_hours, visible_days)
 
-        sprint_data_entry["charts"]["overall"]["earnedHours"].append(None if is_future_date else round(get_last_value(sprint_data_entry["charts"]["overall"]["earnedHours"]) + daily_data[day]["points"], 2))
-        sprint_data_entry["charts"]["overall"]["actualCost"].append(None if is_future_date else round(get_last_value(sprint_data_entry["charts"]["overall"]["actualCost"]) + daily_data[day]["hours"], 2))
-
-        for user in sprint_data_entry["users"]:
-            user_daily = daily_data[day]["users"].get(user, {"points": 0, "hours": 0})
-            sprint_data_entry["charts"][user]["earnedHours"].append(None if is_future_date else round(get_last_value(sprint_data_entry["charts"][user]["earnedHours"]) + user_daily["points"], 2))
-            sprint_data_entry["charts"][user]["actualCost"].append(None if is_future_date else round(get_last_value(sprint_data_entry["charts"][user]["actualCost"]) + user_daily["hours"], 2))
+    no_activity = [0] * sprint_length
+    for user in sprint_data_entry["users"]:
+        row = user_rows.get(user)
+        sprint_data_entry["charts"][user]["earnedHours"] = build_cumulative_series(no_activity if row is None else user_points[row], visible_days)
+        sprint_data_entry["charts"][user]["actualCost"] = build_cumulative_series(no_activity if row is None else user_hours[row], visible_days)
 
     sprint_details = {
         "name": sprint_name, "start": start_date, "end": end_date,
-        "data": daily_data, "planned": planned_hours["overall"],
+        "data": {"points": daily_points, "hours": daily_hours}, "planned": planned_hours["overall"],
     }
+    run_report.count("issues_processed", len(sprint_issues))
+    run_report.count("worklogs_processed", sum(len(issue.fields.worklog.worklogs) for issue in sprint_issues if hasattr(issue.fields, "worklog")))
+    run_report.count("histories_processed", sum(len(issue.changelog.histories) for issue in sprint_issues))
     
     return sprint_data_entry, sprint_details
 
+def snapshot_input_hash(store, sprint, two_phase=False):
+    # Two-phase runs skip changelogs of unpointed issues, so their planned hours can differ from a default run's.
+    sprint_inputs = {
+        "version": SNAPSHOT_VERSION, "storyPointsField": STORY_POINTS_FIELD_ID, "fetchMode": "two-phase" if two_phase else "default",
+        "sprint": [sprint.id, sprint.name, sprint.state, sprint.startDate, sprint.endDate],
+    }
+    return store.sprint_input_hash(sprint.id, sprint_inputs)
+
+def sprint_snapshot_to_json(sprint_data_entry, sprint_details):
+    details = dict(sprint_details)
+    details["start"] = sprint_details["start"].isoformat()
+    details["end"] = sprint_details["end"].isoformat()
+    return {"sprint_data_entry": sprint_data_entry, "sprint_details": details}
+
+def sprint_snapshot_from_json(snapshot):
+    details = snapshot["sprint_details"]
+    details["start"] = datetime.fromisoformat(details["start"]).date()
+    details["end"] = datetime.fromisoformat(details["end"]).date()
+    return snapshot["sprint_data_entry"], details
+
+@run_report.timed("create_all_time_and_ev_pv_views")
 def create_all_time_and_ev_pv_views(all_sprints_data, sprint_details_for_all_time, today):
     relevant_sprints = sorted([s for s in sprint_details_for_all_time if s["name"].startswith("Sprint ")], key=lambda s: s["start"])
     if not relevant_sprints: return
@@ -197,85 +551,324 @@ def create_all_time_and_ev_pv_views(all_sprints_data, sprint_details_for_all_tim
     all_time_end = relevant_sprints[-1]["end"]
     all_time_dates = [all_time_start + timedelta(days=x) for x in range((all_time_end - all_time_start).days + 1)]
 
-    daily_pv = {day: 0 for day in all_time_dates}
+    all_time_length = len(all_time_dates)
+    daily_pv = [0] * all_time_length
     cumulative_pv_at_sprint_start = 0
     for sprint in relevant_sprints:
         sprint_duration_days = (sprint["end"] - sprint["start"]).days
         sprint_length = sprint_duration_days + 1
         daily_increment = (sprint["planned"] / sprint_length) if sprint_length > 0 else sprint["planned"]
-        for i in range(sprint_length):
-            current_day = sprint["start"] + timedelta(days=i)
-            if current_day in daily_pv:
-                daily_pv[current_day] = cumulative_pv_at_sprint_start + (daily_increment * (i + 1))
+        first_offset = (sprint["start"] - all_time_start).days
+        for i in range(max(min(sprint_length, all_time_length - first_offset), 0)):
+            daily_pv[first_offset + i] = cumulative_pv_at_sprint_start + (daily_increment * (i + 1))
         cumulative_pv_at_sprint_start += sprint["planned"]
 
-    all_time_planned_value, all_time_earned, all_time_cost = [], [], []
+    all_time_planned_value = []
     last_pv = 0
-    for day in all_time_dates:
-        if day in daily_pv and daily_pv[day] > 0:
-            last_pv = daily_pv[day]
+    for pv in daily_pv:
+        if pv > 0:
+            last_pv = pv
         all_time_planned_value.append(round(last_pv, 2))
 
-        is_future_date = day > today
-        if is_future_date:
-            all_time_earned.append(None)
-            all_time_cost.append(None)
-            continue
-
-        daily_points, daily_hours = 0, 0
-        for sprint in relevant_sprints:
-            if sprint["start"] <= day <= sprint["end"]:
-                day_data = sprint["data"].get(day)
-                if day_data:
-                    daily_points += day_data.get("points", 0)
-                    daily_hours += day_data.get("hours", 0)
+    # Each day belongs to the earliest-starting sprint that covers it; map day offsets to that sprint's totals directly.
+    daily_points, daily_hours = [0] * all_time_length, [0] * all_time_length
+    is_assigned = [False] * all_time_length
+    for sprint in relevant_sprints:
+        first_offset = (sprint["start"] - all_time_start).days
+        for i, (points, hours) in enumerate(zip(sprint["data"]["points"], sprint["data"]["hours"])):
+            day_offset = first_offset + i
+            if day_offset >= all_time_length:
                 break
-        
-        last_earned = all_time_earned[-1] if all_time_earned else 0
-        last_cost = all_time_cost[-1] if all_time_cost else 0
-        all_time_earned.append(round(last_earned + daily_points, 2))
-        all_time_cost.append(round(last_cost + daily_hours, 2))
+            if not is_assigned[day_offset]:
+                is_assigned[day_offset] = True
+                daily_points[day_offset] = points
+                daily_hours[day_offset] = hours
+
+    visible_days = min(max((today - all_time_start).days + 1, 0), all_time_length)
+    all_time_earned = build_cumulative_series(daily_points, visible_days)
+    all_time_cost = build_cumulative_series(daily_hours, visible_days)
 
     sprint_markers = [{"name": s["name"], "startDate": s["start"].strftime("%Y-%m-%d"), "endDate": s["end"].strftime("%Y-%m-%d"), "planned": s["planned"]} for s in relevant_sprints]
     all_sprints_data["All Time"] = {"dates": [d.strftime("%Y-%m-%d") for d in all_time_dates], "sprint_markers": sprint_markers, "charts": {"overall": {"earnedHours": all_time_earned, "actualCost": all_time_cost}}}
     all_sprints_data["EV/PV"] = {"dates": [d.strftime("%Y-%m-%d") for d in all_time_dates], "charts": {"overall": {"earnedValue": all_time_earned, "plannedValue": all_time_planned_value}}}
 
-def main():
-    validate_config()
+def encode_json(data, compact=False):
+    if not compact:
+        return json.dumps(data, indent=4).encode("utf-8")
+    # orjson writes the same values several times faster; both forms parse back to identical data.
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def write_json_file(path, data, compact=False, precompress=False, replace=False):
+    content = encode_json(data, compact)
+    # Static servers (gzip_static, brotli_static) prefer these siblings over the file, so stale ones are always removed.
+    siblings = {}
+    if precompress:
+        siblings[".gz"] = gzip.compress(content, compresslevel=9, mtime=0)
+        if brotli is not None:
+            siblings[".br"] = brotli.compress(content)
+    for suffix in PRECOMPRESSED_SUFFIXES:
+        if suffix in siblings:
+            with open(f"{path}{suffix}", "wb") as f:
+                f.write(siblings[suffix])
+        elif os.path.exists(f"{path}{suffix}"):
+            os.remove(f"{path}{suffix}")
+    with open(f"{path}.tmp" if replace else path, "wb") as f:
+        f.write(content)
+    if replace:
+        os.replace(f"{path}.tmp", path)
+    return content
+
+def write_shards(all_sprints_data, sprint_ids, directory=SHARD_DIR, compact=False, precompress=False):
+    # The dashboard reads the small manifest first and fetches one shard at a time, so first paint doesn't grow with board history.
+    sprint_dir = os.path.join(directory, "sprints")
+    os.makedirs(sprint_dir, exist_ok=True)
+
+    def write_shard(relative_path, data):
+        content = write_json_file(os.path.join(directory, relative_path), data, compact, precompress)
+        # URLs are relative to the manifest; the content hash lets browsers keep caching shards that didn't change.
+        return f"{relative_path}?v={hashlib.sha1(content).hexdigest()[:12]}"
+
+    def date_range(data):
+        return {"startDate": data["dates"][0] if data["dates"] else None, "endDate": data["dates"][-1] if data["dates"] else None}
+
+    manifest = {"version": 1, "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"), "sprints": [], "views": {}}
+    written = set()
+    for name, data in all_sprints_data.items():
+        if name in SHARD_VIEWS:
+            manifest["views"][name] = {**date_range(data), "url": write_shard(SHARD_VIEWS[name], data)}
+        else:
+            written.add(f"{sprint_ids[name]}.json")
+            manifest["sprints"].append({"name": name, "id": sprint_ids[name], "users": data["users"], **date_range(data), "url": write_shard(f"sprints/{sprint_ids[name]}.json", data)})
+    for file_name in os.listdir(sprint_dir):
+        shard_name = next((file_name[:-len(suffix)] for suffix in PRECOMPRESSED_SUFFIXES if file_name.endswith(suffix)), file_name)
+        if shard_name.endswith(".json") and shard_name not in written:
+            os.remove(os.path.join(sprint_dir, file_name))
+
+    # Swap the manifest in last so a dashboard loading mid-run never sees a shard that isn't written yet.
+    write_json_file(os.path.join(directory, "manifest.json"), manifest, compact, precompress, replace=True)
+    return manifest
+
+def configure_session(session, pool_size=HTTP_POOL_SIZE, keep_alive=True, compression=True):
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # ACCEPT_ENCODING lists gzip/deflate plus br (and zstd) when urllib3 can decode them.
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING if compression else "identity"
+    session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+    return adapter
+
+def log_connection_pool_stats(adapter):
+    pools = adapter.poolmanager.pools
+    totals = {"requests": 0, "connections": 0}
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        reused = pool.num_requests - pool.num_connections
+        hit_ratio = reused / pool.num_requests if pool.num_requests else 0
+        logging.info(f"HTTP pool {pool.host}: {pool.num_requests} requests over {pool.num_connections} connections ({reused} reused, {hit_ratio:.0%} pool hits).")
+        totals["requests"] += pool.num_requests
+        totals["connections"] += pool.num_connections
+    return totals
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch Jira sprint data and build data.json for the dashboard.")
+    parser.add_argument("--store", default=ISSUE_STORE_PATH, help=f"Path of the local issue store (default: {ISSUE_STORE_PATH}).")
+    parser.add_argument("--no-store", action="store_true", help="Fetch every sprint from Jira without using the local issue store.")
+    parser.add_argument("--full-sync", action="store_true", help="Re-download every issue instead of only those updated since the last sync.")
+    parser.add_argument("--two-phase", action="store_true", help="List sprint issues with a lean search first, then fetch worklogs and changelogs only for issues that changed since the last run.")
+    parser.add_argument("--rebuild-snapshots", action="store_true", help="Recompute closed sprints instead of loading their saved snapshots.")
+    parser.add_argument("--rate-limit", type=float, default=REQUESTS_PER_SECOND, help=f"Maximum sustained Jira requests per second across all workers (default: {REQUESTS_PER_SECOND}).")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENT_REQUESTS, help=f"Upper bound for concurrent Jira requests; halved on every 429/503 and regrown on success (default: {MAX_CONCURRENT_REQUESTS}).")
+    parser.add_argument("--pool-size", type=int, default=HTTP_POOL_SIZE, help=f"Connections kept open to Jira (default: {HTTP_POOL_SIZE}).")
+    parser.add_argument("--timeout", type=float, default=HTTP_TIMEOUT, help=f"Seconds to wait for Jira to connect or respond (default: {HTTP_TIMEOUT}).")
+    parser.add_argument("--no-keep-alive", action="store_true", help="Close the connection after every request instead of reusing it.")
+    parser.add_argument("--no-compression", action="store_true", help="Ask Jira for uncompressed responses.")
+    parser.add_argument("--batch-sprints", type=int, default=1, help="Fetch up to N sprints with one 'Sprint in (...)' search and split the issues locally (default: 1).")
+    parser.add_argument("--backend", choices=("threads", "asyncio"), default="threads", help="Fetch with jira-python on worker threads, or with coroutines over aiohttp on one event loop (default: threads).")
+    parser.add_argument("--record", metavar="CASSETTE", help="Save every Jira response of this run to a gzip-compressed cassette file.")
+    parser.add_argument("--replay", metavar="CASSETTE", help="Serve Jira responses from a recorded cassette instead of the network; no credentials are needed.")
+    parser.add_argument("--metrics-file", default=METRICS_PATH, help=f"OpenMetrics textfile written after every run, e.g. into the node-exporter textfile directory (default: {METRICS_PATH}). Pass an empty string to skip it.")
+    parser.add_argument("--shard-dir", default=SHARD_DIR, help=f"Directory for the dashboard's manifest and per-sprint data files (default: {SHARD_DIR}). Pass an empty string to only write data.json.")
+    parser.add_argument("--compact", action="store_true", help="Write data.json and the shards without indentation or spaces, with orjson when it is installed.")
+    parser.add_argument("--precompress", action="store_true", help="Also write .gz (and .br, when brotli is installed) copies of every data file for static hosting.")
+    parser.add_argument("--profile", choices=PROFILE_MODES, help="Profile the run: 'cpu' runs it under cProfile, 'mem' reports the largest allocation sites of each process_sprint call with tracemalloc.")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help=f"Directory for timestamped profile files (default: {PROFILE_DIR}).")
+    parser.add_argument("--profile-top", type=int, default=PROFILE_TOP, help=f"Number of functions or allocation sites listed in profile reports (default: {PROFILE_TOP}).")
+    parser.add_argument("--sprint-workers", type=int, default=SPRINT_WORKERS, help=f"Number of sprints processed in parallel (default: {SPRINT_WORKERS}). Use 1 to process sprints one at a time.")
+    args = parser.parse_args(argv)
+    if args.sprint_workers < 1:
+        parser.error("--sprint-workers must be at least 1")
+    if args.batch_sprints < 1:
+        parser.error("--batch-sprints must be at least 1")
+    if args.rate_limit <= 0 or args.max_concurrency < 1:
+        parser.error("--rate-limit must be positive and --max-concurrency at least 1")
+    if args.pool_size < 1 or args.timeout <= 0:
+        parser.error("--pool-size must be at least 1 and --timeout positive")
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+    if args.profile_top < 1:
+        parser.error("--profile-top must be at least 1")
+    if args.two_phase and args.no_store:
+        parser.error("--two-phase needs the local issue store and cannot be combined with --no-store")
+    return args
+
+def refresh(args, profiler):
     try:
-        jira_client = JIRA(server=JIRA_SERVER, basic_auth=(JIRA_EMAIL, API_TOKEN))
-        logging.info("Successfully connected to Jira.")
+        cassette = Cassette(args.record or args.replay, "record" if args.record else "replay") if args.record or args.replay else None
     except Exception as e:
-        logging.error(f"Failed to connect to Jira: {e}")
+        logging.error(f"Failed to load cassette {args.replay}: {e}")
         return
-
+    if cassette and cassette.replaying:
+        # A replay never reaches Jira, so it runs without credentials.
+        server, basic_auth = JIRA_SERVER or REPLAY_SERVER, (JIRA_EMAIL or "", API_TOKEN or "")
+    else:
+        validate_config()
+        server, basic_auth = JIRA_SERVER, (JIRA_EMAIL, API_TOKEN)
+
+    http_adapter = None
     try:
-        sprints = jira_client.sprints(board_id=BOARD_ID)
+        if args.backend == "asyncio":
+            fetcher = AsyncJiraFetcher(
+                server, basic_auth, rate=args.rate_limit, max_concurrency=args.max_concurrency, pool_size=args.pool_size,
+                timeout=args.timeout, keep_alive=not args.no_keep_alive, compression=not args.no_compression,
+                page_size=SEARCH_PAGE_SIZE, changelog_batch_size=CHANGELOG_BATCH_SIZE, cassette=cassette, report=run_report,
+            )
+        else:
+            scheduler = RequestScheduler(rate=args.rate_limit, max_concurrency=args.max_concurrency)
+            # The scheduler owns retries, so turn off jira-python's own 429 retry loop.
+            jira_client = JIRA(server=server, basic_auth=basic_auth, max_retries=0, timeout=args.timeout, get_server_info=False)
+            http_adapter = configure_session(jira_client._session, args.pool_size, not args.no_keep_alive, not args.no_compression)
+            if cassette:
+                install_cassette(cassette, jira_client._session, http_adapter)
+            run_report.install(jira_client._session)
+            if not (cassette and cassette.replaying):
+                scheduler.install(jira_client._session)
+            # Read the server info only once the session is set up, so it is throttled and recorded like every other request.
+            server_info = jira_client.server_info()
+            jira_client._version = tuple(server_info["versionNumbers"])
+            jira_client.deploymentType = server_info.get("deploymentType")
+            fetcher = JiraFetcher(jira_client, scheduler)
+        logging.info("Successfully connected to Jira.")
     except Exception as e:
-        logging.error(f"Error finding sprints: {e}")
+        logging.error(f"Failed to connect to Jira: {e}")
         return
 
-    all_sprints_data = {}
-    sprint_details_for_all_time = []
-    today = datetime.now(timezone.utc).date()
-
-    for sprint in sprints:
-        if sprint.state == "future" or "SCRUM" in sprint.name.upper():
-            if "SCRUM" in sprint.name.upper(): logging.info(f"--- Skipping sprint: {sprint.name} as it contains 'SCRUM' ---")
-            continue
-        
-        sprint_data_entry, sprint_details = process_sprint(sprint, jira_client, today)
+    # Close the fetcher on every exit, or aiohttp warns about an unclosed client session, and keep what a failed run recorded.
+    try:
+        try:
+            with run_report.phase("list_sprints"):
+                sprints = fetcher.list_sprints(BOARD_ID)
+        except Exception as e:
+            logging.error(f"Error finding sprints: {e}")
+            return
+
+        all_sprints_data = {}
+        sprint_details_for_all_time = []
+        today = datetime.now(timezone.utc).date()
+        store = None if args.no_store else IssueStore(args.store)
+
+        use_snapshots = store is not None and not (args.rebuild_snapshots or args.full_sync)
+
+        sprints_to_process = []
+        for sprint in sprints:
+            if sprint.state == "future" or "SCRUM" in sprint.name.upper():
+                if "SCRUM" in sprint.name.upper(): logging.info(f"--- Skipping sprint: {sprint.name} as it contains 'SCRUM' ---")
+                continue
+            sprints_to_process.append(sprint)
+
+        # Closed sprints never change, so reuse their last result while the stored inputs are unchanged.
+        results = {}
+        pending_sprints = []
+        for sprint in sprints_to_process:
+            snapshot = store.load_snapshot(sprint.id, snapshot_input_hash(store, sprint, args.two_phase)) if use_snapshots and sprint.state == "closed" else None
+            if snapshot:
+                logging.info(f"--- Loaded snapshot for closed sprint: {sprint.name} (ID: {sprint.id}) ---")
+                results[sprint.id] = sprint_snapshot_from_json(snapshot)
+            else:
+                pending_sprints.append(sprint)
+
+        def fetch_and_process_sprints(sprint_group):
+            with run_report.phase("fetch_sprint_issues"):
+                if store:
+                    issues_by_sprint = sync_sprint_issues(fetcher, store, sprint_group, args.full_sync, args.two_phase)
+                else:
+                    issues_by_sprint = fetch_sprint_group_issues(fetcher, sprint_group)
+
+            group_results = {}
+            for sprint in sprint_group:
+                with profiler.sprint(sprint.name):
+                    sprint_data_entry, sprint_details = process_sprint(sprint, issues_by_sprint[sprint.id], today)
+                if store and sprint.state == "closed" and sprint_data_entry:
+                    store.save_snapshot(sprint.id, snapshot_input_hash(store, sprint, args.two_phase), sprint_snapshot_to_json(sprint_data_entry, sprint_details))
+                group_results[sprint.id] = (sprint_data_entry, sprint_details)
+            return group_results
+
+        sprint_groups = [pending_sprints[i:i + args.batch_sprints] for i in range(0, len(pending_sprints), args.batch_sprints)]
+        with ThreadPoolExecutor(max_workers=args.sprint_workers) as executor:
+            for group_results in executor.map(fetch_and_process_sprints, sprint_groups):
+                results.update(group_results)
+        if store:
+            store.close()
+        logging.info(fetcher.summary())
+        run_report.details.update(backend=args.backend, sprints={"total": len(sprints_to_process), "from_snapshots": len(sprints_to_process) - len(pending_sprints)}, jira=fetcher.stats())
+        if http_adapter:
+            run_report.details["http_pool"] = log_connection_pool_stats(http_adapter)
+    finally:
+        fetcher.close()
+        if cassette:
+            cassette.save()
+
+    # Assemble in board order so the output matches a sequential run.
+    sprint_ids = {}
+    for sprint in sprints_to_process:
+        sprint_data_entry, sprint_details = results[sprint.id]
         if sprint_data_entry:
             all_sprints_data[sprint.name] = sprint_data_entry
+            sprint_ids[sprint.name] = sprint.id
         if sprint_details and sprint.name.startswith("Sprint "):
             sprint_details_for_all_time.append(sprint_details)
 
     create_all_time_and_ev_pv_views(all_sprints_data, sprint_details_for_all_time, today)
     
-    with open("data.json", "w") as f:
-        json.dump(all_sprints_data, f, indent=4)
+    if args.precompress and brotli is None:
+        logging.info("brotli is not installed (pip install brotli), so only .gz copies are written.")
+    with run_report.phase("write_data_json"):
+        write_json_file("data.json", all_sprints_data, args.compact, args.precompress)
+    run_report.details["data_json_bytes"] = os.path.getsize("data.json")
+    if args.shard_dir:
+        with run_report.phase("write_shards"):
+            manifest = write_shards(all_sprints_data, sprint_ids, args.shard_dir, args.compact, args.precompress)
+        logging.info(f"Wrote {len(manifest['sprints'])} sprint shards and {len(manifest['views'])} views to {args.shard_dir}/.")
+    run_report.details["caches"] = {cache.__name__: cache.cache_info()._asdict() for cache in (parse_jira_date, parse_jira_day)}
     logging.info("\nSUCCESS! data.json file has been updated.")
     logging.info("You can now open your index.html file to view the chart.")
+    return True
+
+def main(argv=None):
+    args = parse_args(argv)
+    profiler = Profiler(args.profile, args.profile_dir, args.profile_top)
+    if args.profile == "mem" and args.sprint_workers > 1:
+        # Snapshots are process-wide, so only a sequential run attributes allocations to the right sprint.
+        logging.info("Memory profiling processes sprints one at a time.")
+        args.sprint_workers = 1
+    # Process CPU for the whole run, since sprints are fetched and processed on worker threads.
+    succeeded = False
+    try:
+        with profiler.run(), run_report.phase("main", cpu_clock=time.process_time):
+            succeeded = bool(refresh(args, profiler))
+    finally:
+        # Write the report even when refresh raises, so a crashed run still leaves its timings behind.
+        report = run_report.write(RUN_REPORT_PATH)
+        for line in run_report.summary_lines(report):
+            logging.info(line)
+        logging.info(f"Run report written to {RUN_REPORT_PATH}.")
+        if args.metrics_file:
+            # Failed and crashed runs are exported too, so an alert can fire on jira_refresh_success.
+            write_textfile(args.metrics_file, render_openmetrics(report, run_report.durations.get("process_sprint", []), succeeded))
+            logging.info(f"Metrics written to {args.metrics_file}.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,159 @@
+#
+# metricsExporter.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: OpenMetrics export of refresh pipeline health. `jsonCreator.py`
+#              renders the run report into a textfile after every run, for the
+#              node-exporter textfile collector; run this file directly to
+#              serve the latest textfile on a local /metrics endpoint instead.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "jira_refresh"
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+SPRINT_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_sample(name, value, labels=None):
+    label_text = "{" + ",".join(f'{key}="{escape_label(label)}"' for key, label in labels.items()) + "}" if labels else ""
+    return f"{name}{label_text} {float(value):.10g}" if isinstance(value, float) else f"{name}{label_text} {value}"
+
+def hit_ratio(hits, misses):
+    return hits / (hits + misses) if hits + misses else 0.0
+
+def render_openmetrics(report, sprint_durations=(), success=True, finished_at=None):
+    # Each run is a batch job, so everything is a gauge of the last run, apart from the sprint time histogram.
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+        lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+        for labels, value in samples:
+            lines.append(format_sample(f"{PREFIX}_{name}", value, labels))
+
+    phases, counts, jira, http = report.get("phases", {}), report.get("counts", {}), report.get("jira", {}), report.get("http", {})
+    metric("success", "gauge", "Whether the last refresh wrote data.json.", [(None, int(success))])
+    metric("last_run_timestamp_seconds", "gauge", "Unix time the last refresh finished.", [(None, finished_at or time.time())])
+    metric("duration_seconds", "gauge", "Wall time of the last refresh.", [(None, phases.get("main", {}).get("wall_s", 0.0))])
+    metric("cpu_seconds", "gauge", "Process CPU time of the last refresh.", [(None, phases.get("main", {}).get("cpu_s", 0.0))])
+    metric("phase_seconds", "gauge", "Wall time per refresh step, summed over parallel workers.",
+           [({"phase": name}, phase["wall_s"]) for name, phase in phases.items() if name != "main"])
+
+    lines.append(f"# TYPE {PREFIX}_sprint_processing_seconds histogram")
+    lines.append(f"# HELP {PREFIX}_sprint_processing_seconds Time spent in process_sprint per sprint in the last refresh.")
+    for bound in SPRINT_SECONDS_BUCKETS:
+        lines.append(format_sample(f"{PREFIX}_sprint_processing_seconds_bucket", sum(duration <= bound for duration in sprint_durations), {"le": f"{bound}"}))
+    lines.append(format_sample(f"{PREFIX}_sprint_processing_seconds_bucket", len(sprint_durations), {"le": "+Inf"}))
+    lines.append(format_sample(f"{PREFIX}_sprint_processing_seconds_count", len(sprint_durations)))
+    lines.append(format_sample(f"{PREFIX}_sprint_processing_seconds_sum", float(sum(sprint_durations))))
+
+    sprints = report.get("sprints", {})
+    metric("sprints", "gauge", "Sprints in the last refresh, by where their result came from.",
+           [({"source": "computed"}, sprints.get("total", 0) - sprints.get("from_snapshots", 0)), ({"source": "snapshot"}, sprints.get("from_snapshots", 0))])
+    metric("issues_processed", "gauge", "Issues processed in the last refresh.", [(None, counts.get("issues_processed", 0))])
+    metric("worklogs_processed", "gauge", "Worklogs processed in the last refresh.", [(None, counts.get("worklogs_processed", 0))])
+    metric("histories_processed", "gauge", "Changelog histories processed in the last refresh.", [(None, counts.get("histories_processed", 0))])
+
+    endpoints = http.get("endpoints", {})
+    metric("api_requests", "gauge", "Jira HTTP requests sent in the last refresh, including throttled attempts.",
+           [({"endpoint": name}, endpoint["requests"]) for name, endpoint in endpoints.items()])
+    metric("api_errors", "gauge", "Jira HTTP requests answered with an error status, including throttled attempts.",
+           [({"endpoint": name}, endpoint["errors"]) for name, endpoint in endpoints.items()])
+    metric("api_received_bytes", "gauge", "Decoded Jira response bytes received in the last refresh.",
+           [({"endpoint": name}, endpoint["bytes"]) for name, endpoint in endpoints.items()])
+    metric("api_latency_seconds", "gauge", "Jira request latency percentiles in the last refresh.",
+           [({"endpoint": name, "stat": stat}, endpoint["latency_s"][stat]) for name, endpoint in endpoints.items() for stat in ("p50", "p95", "max")])
+    metric("api_throttled", "gauge", "Jira 429 and 503 responses in the last refresh.", [(None, jira.get("throttled", 0))])
+    metric("api_retries", "gauge", "Jira requests retried in the last refresh.", [(None, jira.get("retries", 0))])
+    metric("api_failures", "gauge", "Jira requests that failed after retries in the last refresh.", [(None, jira.get("failures", 0))])
+
+    cache_ratios = [({"cache": name}, hit_ratio(cache["hits"], cache["misses"])) for name, cache in report.get("caches", {}).items()]
+    if sprints.get("total"):
+        cache_ratios.append(({"cache": "sprint_snapshots"}, sprints["from_snapshots"] / sprints["total"]))
+    if counts.get("store_issues_loaded"):
+        unchanged = max(counts["store_issues_loaded"] - counts.get("store_issues_changed", 0), 0)
+        cache_ratios.append(({"cache": "issue_store"}, unchanged / counts["store_issues_loaded"]))
+    if report.get("http_pool", {}).get("requests"):
+        pool = report["http_pool"]
+        cache_ratios.append(({"cache": "http_pool"}, (pool["requests"] - pool["connections"]) / pool["requests"]))
+    metric("cache_hit_ratio", "gauge", "Hit ratio of each cache in the last refresh.", cache_ratios)
+
+    metric("data_json_bytes", "gauge", "Size of the data.json written by the last refresh.", [(None, report.get("data_json_bytes", 0))])
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+def write_textfile(path, text):
+    # Write beside the target and rename, so the textfile collector never reads a half-written file.
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, prefix=".metrics-", suffix=".tmp", delete=False) as f:
+        f.write(text)
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, path)
+
+def make_handler(path):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            try:
+                with open(path, "rb") as f:
+                    body = f.read()
+            except FileNotFoundError:
+                self.send_error(503, f"{path} has not been written yet")
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logging.debug(f"{self.address_string()} {format % args}")
+
+    return MetricsHandler
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the metrics textfile written by jsonCreator.py on a local /metrics endpoint.")
+    parser.add_argument("--file", default=os.getenv("METRICS_PATH", "jira_refresh.prom"), help="Metrics textfile to serve (default: METRICS_PATH or jira_refresh.prom).")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=9464, help="Port to listen on (default: 9464).")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    args = parse_args(argv)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.file))
+    logging.info(f"Serving {args.file} on http://{args.host}:{server.server_port}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
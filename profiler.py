@@ -0,0 +1,169 @@
+#
+# profiler.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: Opt-in profiling for `jsonCreator.py`. `--profile cpu` runs
+#              the refresh under cProfile and writes a .pstats file plus a
+#              hot function table; `--profile mem` diffs tracemalloc snapshots
+#              around every process_sprint call and reports the largest
+#              allocation sites. Files are timestamped per run.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_MODES = ("cpu", "mem")
+PROFILE_TOP = 25
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+def format_bytes(size):
+    return f"{size / 2 ** 20:+.2f} MiB" if abs(size) >= 2 ** 20 else f"{size / 2 ** 10:+.1f} KiB"
+
+class Profiler:
+    def __init__(self, mode=None, directory="profiles", top=PROFILE_TOP):
+        self.mode = mode
+        self.directory = directory
+        self.top = top
+        self.stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._lock = threading.Lock()
+        self._profiles = []
+        self._sprints = []
+
+    def path(self, suffix):
+        return os.path.join(self.directory, f"{self.mode}-{self.stamp}{suffix}")
+
+    @contextmanager
+    def run(self):
+        if self.mode == "cpu":
+            with self._cpu_profile():
+                yield
+        elif self.mode == "mem":
+            # One frame per allocation is enough to group by line and keeps tracing cheap.
+            tracemalloc.start()
+            try:
+                yield
+            finally:
+                tracemalloc.stop()
+                self._write_memory_report()
+        else:
+            yield
+
+    @contextmanager
+    def _cpu_profile(self):
+        # Before 3.12 a cProfile profiler only sees the thread that enabled it, so give every thread started during the run its own and merge them.
+        # From 3.12 cProfile runs on sys.monitoring: one profiler sees every thread, and enabling a second one raises.
+        per_thread = sys.version_info < (3, 12)
+
+        def profile_thread(*_):
+            try:
+                profile = cProfile.Profile()
+                profile.enable()
+            except Exception as e:
+                # A profiler failure must never take down the worker thread it runs on.
+                logging.debug(f"Could not profile thread {threading.current_thread().name}: {e}")
+                return
+            with self._lock:
+                self._profiles.append(profile)
+
+        main_profile = cProfile.Profile()
+        self._profiles.append(main_profile)
+        if per_thread:
+            threading.setprofile(profile_thread)
+        main_profile.enable()
+        try:
+            yield
+        finally:
+            main_profile.disable()
+            if per_thread:
+                threading.setprofile(None)
+            self._write_cpu_report()
+
+    def _write_cpu_report(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(*profiles)
+        stats.dump_stats(self.path(".pstats"))
+
+        tables = {}
+        for sort_key in ("own", "cumulative"):
+            stream = io.StringIO()
+            pstats.Stats(self.path(".pstats"), stream=stream).strip_dirs().sort_stats("tottime" if sort_key == "own" else sort_key).print_stats(self.top)
+            tables[sort_key] = stream.getvalue()
+        with open(self.path(".txt"), "w") as f:
+            for sort_key, table in tables.items():
+                f.write(f"Top {self.top} functions by {sort_key} time ({len(profiles)} threads profiled)\n{table}\n")
+        logging.info(f"Top {self.top} functions by own time:\n{tables['own'].strip()}")
+        logging.info(f"CPU profile written to {self.path('.pstats')} and {self.path('.txt')}.")
+
+    @contextmanager
+    def sprint(self, name):
+        if self.mode != "mem":
+            yield
+            return
+        before = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        tracemalloc.reset_peak()
+        start_size = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] - start_size
+            after = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+            diffs = after.compare_to(before, "lineno")
+            with self._lock:
+                self._sprints.append({"name": name, "peak": peak, "growth": sum(diff.size_diff for diff in diffs), "diffs": diffs})
+
+    def _write_memory_report(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            sprints = list(self._sprints)
+        # Sites are summed over every sprint, so a line that allocates a little per sprint still shows up.
+        sites = defaultdict(lambda: [0, 0])
+        for sprint in sprints:
+            for diff in sprint["diffs"]:
+                site = sites[str(diff.traceback)]
+                site[0] += diff.size_diff
+                site[1] += diff.count_diff
+        top_sites = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:self.top]
+
+        lines = [f"Memory retained across {len(sprints)} process_sprint calls, by allocation site:"]
+        lines += [f"  {format_bytes(size):>14} {count:>+9} blocks  {site}" for site, (size, count) in top_sites]
+        lines.append("")
+        lines.append("Per sprint (peak is the high-water mark above the starting size while the sprint was processed):")
+        for sprint in sorted(sprints, key=lambda sprint: sprint["peak"], reverse=True):
+            lines.append(f"  {sprint['name']}: peak {format_bytes(sprint['peak'])}, retained {format_bytes(sprint['growth'])}")
+            for diff in sprint["diffs"][:5]:
+                lines.append(f"      {format_bytes(diff.size_diff):>14} {diff.count_diff:>+9} blocks  {diff.traceback}")
+        with open(self.path(".txt"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+        logging.info("\n".join(lines[:self.top + 1]))
+        logging.info(f"Memory profile written to {self.path('.txt')}.")
@@ -0,0 +1,82 @@
+#
+# rawIssues.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: Pure helpers over raw Jira issue JSON shared by both fetch
+#              backends in `jsonCreator.py` and `asyncFetcher.py`: search
+#              paging and deduplication, picking issues whose embedded
+#              worklogs or changelogs are truncated, and writing complete
+#              ones back. They never talk to Jira themselves.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import logging
+from issueStore import normalize_history
+
+ID_QUERY_BATCH_SIZE = 100
+BULK_CHANGELOG_PAGE_SIZE = 10000
+
+def id_batches(raw_issues, batch_size=ID_QUERY_BATCH_SIZE):
+    return [[raw["id"] for raw in raw_issues[i:i + batch_size]] for i in range(0, len(raw_issues), batch_size)]
+
+def id_query(issue_ids):
+    return f"id in ({','.join(issue_ids)})"
+
+def remaining_page_starts(first_page_size, total, page_size):
+    # Jira may cap maxResults below what we asked for, so page by what it actually returned.
+    page_size = first_page_size or page_size
+    return page_size, range(first_page_size, total, page_size)
+
+def dedupe_search_results(issues, total, jql_query, issue_id=lambda raw: raw["id"]):
+    seen_ids = set()
+    unique_issues = []
+    for issue in issues:
+        if issue_id(issue) not in seen_ids:
+            seen_ids.add(issue_id(issue))
+            unique_issues.append(issue)
+    if len(unique_issues) < total:
+        logging.warning(f"Fetched {len(unique_issues)} of {total} issues for '{jql_query}'; results changed while paging.")
+    return unique_issues
+
+def truncated_worklog_issues(raw_issues):
+    # Search results only embed the first page of worklogs; only issues that have more need a backfill.
+    return [raw for raw in raw_issues if "worklog" in raw["fields"] and raw["fields"]["worklog"].get("total", 0) > len(raw["fields"]["worklog"].get("worklogs", []))]
+
+def set_complete_worklogs(raw, worklogs):
+    raw["fields"]["worklog"] = {"startAt": 0, "maxResults": len(worklogs), "total": len(worklogs), "worklogs": worklogs}
+
+def is_changelog_truncated(raw):
+    changelog = raw.get("changelog")
+    return changelog is None or changelog.get("total", 0) > len(changelog.get("histories", []))
+
+def changelog_targets(raw_issues, only_truncated=True):
+    return [raw for raw in raw_issues if not only_truncated or is_changelog_truncated(raw)]
+
+def embedded_histories(raw):
+    return raw.get("changelog", {}).get("histories", [])
+
+def bulk_changelog_request(issue_ids):
+    return {"issueIdsOrKeys": issue_ids, "maxResults": BULK_CHANGELOG_PAGE_SIZE}
+
+def merge_bulk_changelogs(histories, response):
+    for issue_changelog in response.get("issueChangeLogs", []):
+        histories.setdefault(str(issue_changelog["issueId"]), []).extend(normalize_history(h) for h in issue_changelog.get("changeHistories", []))
+
+def set_complete_changelogs(raw_issues, histories):
+    for raw in raw_issues:
+        issue_histories = histories.get(raw["id"], [])
+        raw["changelog"] = {"startAt": 0, "maxResults": len(issue_histories), "total": len(issue_histories), "histories": issue_histories}
@@ -0,0 +1,193 @@
+#
+# requestScheduler.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: Shared throttle for every HTTP request `jsonCreator.py` sends
+#              to Jira. Combines a token bucket, an AIMD concurrency limit
+#              driven by 429/503 responses and Retry-After, and jittered
+#              retries, so parallel workers back off together instead of
+#              stampeding the server. The asyncio backend reuses the same
+#              AIMD state.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+THROTTLE_STATUSES = (429, 503)
+
+def response_status(result):
+    for holder in (result, getattr(result, "response", None)):
+        status = getattr(holder, "status_code", None) or getattr(holder, "code", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+def retry_after_seconds(result):
+    for holder in (result, getattr(result, "response", None)):
+        headers = getattr(holder, "headers", None)
+        value = headers.get("Retry-After") if headers is not None else None
+        if value is None:
+            continue
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+class AdaptiveConcurrency:
+    # AIMD state shared by the threaded and asyncio backends. It holds no lock: callers update it under their own.
+    def __init__(self, max_concurrency=8, min_concurrency=1, base_backoff=1.0, max_backoff=60.0):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.limit = float(max_concurrency)
+        self.paused_until = 0.0
+        self.throttled = 0
+        self.retries = 0
+
+    @property
+    def concurrency_limit(self):
+        return max(int(self.limit), self.min_concurrency)
+
+    def increase(self):
+        # Additive increase: roughly one extra slot per window of successful requests.
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+    def back_off(self, result, attempt):
+        retry_after = retry_after_seconds(result)
+        if retry_after is None:
+            delay = random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+        else:
+            delay = min(retry_after, self.max_backoff) + random.uniform(0, self.base_backoff)
+        # Multiplicative decrease, and hold every worker until the server's requested pause is over.
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        self.throttled += 1
+        self.retries += 1
+
+class RequestScheduler:
+    def __init__(self, rate=10.0, burst=None, max_concurrency=8, min_concurrency=1, max_retries=5, base_backoff=1.0, max_backoff=60.0):
+        self.rate = rate
+        self.burst = burst or max(rate, 1.0)
+        self.max_retries = max_retries
+
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._bucket_lock = threading.Lock()
+
+        self.concurrency = AdaptiveConcurrency(max_concurrency, min_concurrency, base_backoff, max_backoff)
+        self._in_flight = 0
+        self._slots = threading.Condition()
+
+        self._started_at = time.monotonic()
+        self.requests = 0
+        self.failures = 0
+
+    def install(self, session):
+        # Every jira-python call goes through session.request, including the paging done inside the library.
+        send = session.request
+        session.request = lambda method, url, **kwargs: self.call(send, method, url, **kwargs)
+        return session
+
+    def call(self, fn, *args, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            self._acquire_slot()
+            self._take_token()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._release_slot()
+                if response_status(e) not in THROTTLE_STATUSES or attempt == self.max_retries:
+                    self._count(failed=True)
+                    raise
+                self._back_off(e, attempt)
+                continue
+
+            self._release_slot()
+            if response_status(result) in THROTTLE_STATUSES and attempt < self.max_retries:
+                self._back_off(result, attempt)
+                continue
+            self._count(failed=False)
+            self._increase_concurrency()
+            return result
+
+    def _acquire_slot(self):
+        with self._slots:
+            while True:
+                pause = self.concurrency.paused_until - time.monotonic()
+                if pause > 0:
+                    self._slots.wait(pause)
+                elif self._in_flight >= self.concurrency.concurrency_limit:
+                    self._slots.wait()
+                else:
+                    self._in_flight += 1
+                    return
+
+    def _release_slot(self):
+        with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
+    def _take_token(self):
+        while True:
+            with self._bucket_lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def _increase_concurrency(self):
+        with self._slots:
+            self.concurrency.increase()
+            self._slots.notify_all()
+
+    def _back_off(self, result, attempt):
+        with self._slots:
+            self.concurrency.back_off(result, attempt)
+
+    def _count(self, failed):
+        with self._slots:
+            self.requests += 1
+            self.failures += failed
+
+    def requests_per_second(self):
+        elapsed = time.monotonic() - self._started_at
+        return self.requests / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        return {
+            "requests": self.requests, "throttled": self.concurrency.throttled, "retries": self.concurrency.retries, "failures": self.failures,
+            "requests_per_second": self.requests_per_second(), "concurrency_limit": self.concurrency.concurrency_limit,
+        }
+
+    def summary(self):
+        return (
+            f"Jira requests: {self.requests} in {time.monotonic() - self._started_at:.1f}s "
+            f"({self.requests_per_second():.2f} req/s), {self.concurrency.throttled} throttled, {self.concurrency.retries} retries, "
+            f"{self.failures} failed, final concurrency limit {self.concurrency.concurrency_limit}."
+        )
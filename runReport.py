@@ -0,0 +1,163 @@
+#
+# runReport.py
+#
+# Author: mythster (Ashir Gowardhan)
+# Date Created: 2026-10-18
+# Description: Run instrumentation for `jsonCreator.py`. Collects wall and
+#              CPU time per phase, and request counts, bytes and latency per
+#              Jira endpoint, then writes them as a JSON run report next to
+#              `data.json` and logs a one-screen summary.
+#
+# Copyright 2024 mythster
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from urllib.parse import urlsplit
+from requestScheduler import response_status
+
+SUMMARY_ENDPOINTS = 8
+
+ID_SEGMENT = re.compile(r"\d+|[A-Z][A-Z0-9_]*-\d+")
+
+def endpoint_name(method, url):
+    # Collapse issue, board and sprint ids so requests group by endpoint rather than by resource; keep the API version.
+    segments = urlsplit(url).path.split("/")
+    path = "/".join("{id}" if ID_SEGMENT.fullmatch(segment) and previous != "api" else segment for previous, segment in zip([""] + segments, segments))
+    return f"{method.upper()} {path}"
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+class RunReport:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.now(timezone.utc)
+        self.phases = defaultdict(lambda: {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "max_wall_s": 0.0})
+        self.durations = defaultdict(list)
+        self.endpoints = defaultdict(lambda: {"requests": 0, "errors": 0, "bytes": 0, "latencies": []})
+        self.counts = defaultdict(int)
+        self.details = {}
+
+    @contextmanager
+    def phase(self, name, cpu_clock=time.thread_time):
+        # Thread CPU by default, since sprints are processed on worker threads; main() passes process_time.
+        wall_started, cpu_started = time.perf_counter(), cpu_clock()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall_started, cpu_clock() - cpu_started
+            with self._lock:
+                phase = self.phases[name]
+                phase["calls"] += 1
+                phase["wall_s"] += wall
+                phase["cpu_s"] += cpu
+                phase["max_wall_s"] = max(phase["max_wall_s"], wall)
+                self.durations[name].append(wall)
+
+    def timed(self, name):
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.phase(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counts[name] += amount
+
+    def record_request(self, method, url, status, size, seconds):
+        with self._lock:
+            endpoint = self.endpoints[endpoint_name(method, url)]
+            endpoint["requests"] += 1
+            endpoint["errors"] += status is None or status >= 400
+            endpoint["bytes"] += size
+            endpoint["latencies"].append(seconds)
+
+    def install(self, session):
+        # Install before the scheduler so every attempt, including retried 429s, is measured on its own.
+        send = session.request
+
+        def timed_request(method, url, **kwargs):
+            started = time.perf_counter()
+            try:
+                response = send(method, url, **kwargs)
+            except Exception as e:
+                self.record_request(method, url, response_status(e), 0, time.perf_counter() - started)
+                raise
+            self.record_request(method, url, response.status_code, len(response.content), time.perf_counter() - started)
+            return response
+
+        session.request = timed_request
+        return session
+
+    def to_json(self):
+        with self._lock:
+            endpoints = {
+                name: {
+                    "requests": endpoint["requests"], "errors": endpoint["errors"], "bytes": endpoint["bytes"],
+                    "latency_s": {
+                        "total": sum(endpoint["latencies"]), "mean": sum(endpoint["latencies"]) / len(endpoint["latencies"]),
+                        "p50": percentile(endpoint["latencies"], 0.5), "p95": percentile(endpoint["latencies"], 0.95), "max": max(endpoint["latencies"]),
+                    },
+                }
+                for name, endpoint in self.endpoints.items()
+            }
+            return {
+                "started_at": self.started_at.isoformat(),
+                "finished_at": datetime.now(timezone.utc).isoformat(),
+                "phases": {name: dict(phase) for name, phase in self.phases.items()},
+                "counts": dict(self.counts),
+                "http": {
+                    "requests": sum(endpoint["requests"] for endpoint in endpoints.values()),
+                    "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+                    "bytes": sum(endpoint["bytes"] for endpoint in endpoints.values()),
+                    "endpoints": endpoints,
+                },
+                **self.details,
+            }
+
+    def write(self, path):
+        report = self.to_json()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=4)
+        return report
+
+    def summary_lines(self, report=None):
+        report = report or self.to_json()
+        lines = ["Run summary (phases overlap: process_sprint includes its planned-points calls):"]
+        for name, phase in report["phases"].items():
+            lines.append(f"  {name:<36} {phase['calls']:>5} calls  wall {phase['wall_s']:>8.2f}s  cpu {phase['cpu_s']:>8.2f}s  max {phase['max_wall_s']:>7.2f}s")
+        http = report["http"]
+        lines.append(f"  Jira: {http['requests']} requests, {http['bytes'] / 2 ** 20:.2f} MiB received, {http['errors']} errors")
+        slowest = sorted(http["endpoints"].items(), key=lambda item: item[1]["latency_s"]["total"], reverse=True)[:SUMMARY_ENDPOINTS]
+        for name, endpoint in slowest:
+            latency = endpoint["latency_s"]
+            lines.append(
+                f"  {name:<48} {endpoint['requests']:>6} req {endpoint['bytes'] / 2 ** 20:>8.2f} MiB  "
+                f"p50 {latency['p50'] * 1000:>6.0f}ms  p95 {latency['p95'] * 1000:>6.0f}ms  max {latency['max'] * 1000:>6.0f}ms"
+            )
+        return lines
+
+run_report = RunReport()
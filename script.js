@@ -4,8 +4,9 @@
  * Author: mythster (Ashir Gowardhan)
  * Date Created: 2025-05-19
  * Description: Handles all client-side logic for the Jira Sprint Dashboard.
- * It fetches the `data.json` file, populates the sprint and user
- * filters, and uses Chart.js to render and update the burn-up
+ * It loads the `data/manifest.json` index, populates the sprint and
+ * user filters, fetches each sprint's data file only when it is
+ * selected, and uses Chart.js to render and update the burn-up
  * and EV/PV charts based on user selections.
  *
  * Copyright 2024 mythster
@@ -26,7 +27,8 @@
 document.addEventListener('DOMContentLoaded', () => {
     const state = {
         burnupChart: null,
-        fullData: null,
+        manifest: null,
+        shards: new Map(),
     };
 
     const elements = {
@@ -40,15 +42,13 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function initializeDashboard() {
         try {
-            const response = await fetch(`data.json?v=${new Date().getTime()}`);
-            if (!response.ok) throw new Error('data.json not found. Please run the Python script first.');
-            state.fullData = await response.json();
-            
-            if (!state.fullData || Object.keys(state.fullData).length === 0) {
-                throw new Error('data.json is empty or invalid. Please run the Python script to generate data.');
+            state.manifest = await loadManifest();
+
+            if (state.manifest.sprints.length === 0 && Object.keys(state.manifest.views).length === 0) {
+                throw new Error('The dashboard data is empty. Please run the Python script to generate data.');
             }
-            
-            const sprintNames = Object.keys(state.fullData).filter(name => name !== "All Time" && name !== "EV/PV");
+
+            const sprintNames = state.manifest.sprints.map(sprint => sprint.name);
             populateSprintFilter(sprintNames);
             
             handleViewChange();
@@ -63,14 +63,68 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    function handleViewChange() {
+    async function loadManifest() {
+        const response = await fetch(`data/manifest.json?v=${new Date().getTime()}`);
+        if (response.ok) {
+            const manifest = await response.json();
+            // Shard URLs are relative to the manifest.
+            const resolve = entry => ({ ...entry, url: new URL(entry.url, response.url).href });
+            return {
+                sprints: manifest.sprints.map(resolve),
+                views: Object.fromEntries(Object.entries(manifest.views).map(([name, view]) => [name, resolve(view)])),
+            };
+        }
+
+        // Output written without shards: load the single data.json and serve every shard from it.
+        const fallback = await fetch(`data.json?v=${new Date().getTime()}`);
+        if (!fallback.ok) throw new Error('data/manifest.json not found. Please run the Python script first.');
+        const fullData = await fallback.json();
+        if (!fullData || Object.keys(fullData).length === 0) {
+            throw new Error('data.json is empty or invalid. Please run the Python script to generate data.');
+        }
+
+        const manifest = { sprints: [], views: {} };
+        Object.entries(fullData).forEach(([name, data]) => {
+            const entry = { name, users: data.users, url: `data.json#${name}` };
+            state.shards.set(entry.url, Promise.resolve(data));
+            if (name === "All Time" || name === "EV/PV") manifest.views[name] = entry;
+            else manifest.sprints.push(entry);
+        });
+        return manifest;
+    }
+
+    function loadShard(entry) {
+        if (!state.shards.has(entry.url)) {
+            const shard = fetch(entry.url).then(response => {
+                if (!response.ok) throw new Error(`${entry.url} not found. Please run the Python script again.`);
+                return response.json();
+            });
+            // Forget failed loads so selecting the same sprint again retries it.
+            shard.catch(() => state.shards.delete(entry.url));
+            state.shards.set(entry.url, shard);
+        }
+        return state.shards.get(entry.url);
+    }
+
+    async function handleViewChange() {
         const selectedView = elements.viewSelector.value;
         elements.sprintControls.style.display = 'none';
 
         if (selectedView === 'ev_pv') {
-            if (state.fullData['EV/PV']) {
+            const evPvEntry = state.manifest.views['EV/PV'];
+            if (evPvEntry) {
+                let evPvData;
+                try {
+                    evPvData = await loadShard(evPvEntry);
+                } catch (error) {
+                    if(state.burnupChart) state.burnupChart.clear();
+                    console.error('Error loading EV/PV data:', error);
+                    return;
+                }
+                // The view may have been switched back while the data was loading.
+                if (elements.viewSelector.value !== 'ev_pv') return;
                 const chartTitle = "Performance: Earned Value vs. Planned Value (All Time)";
-                drawEvPvChart(state.fullData['EV/PV'], chartTitle);
+                drawEvPvChart(evPvData, chartTitle);
             }
         } else {
             elements.sprintControls.style.display = 'flex';
@@ -98,18 +152,29 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
   
-    function updateSprintDashboard() {
+    async function updateSprintDashboard() {
         const selectedSprint = elements.sprintFilter.value;
-        if (!selectedSprint || !state.fullData[selectedSprint]) {
+        const sprintEntry = state.manifest.sprints.find(sprint => sprint.name === selectedSprint);
+        if (!selectedSprint || !sprintEntry) {
            if(state.burnupChart) state.burnupChart.clear();
            console.error(`Data for sprint "${selectedSprint}" not found.`);
            return;
         }
-        const sprintData = state.fullData[selectedSprint];
-        
-        populateUserFilter(sprintData.users);
+
+        populateUserFilter(sprintEntry.users);
         const selectedUser = elements.userFilter.value;
         const chartTitle = `Burn-Up: ${elements.sprintFilter.value} - ${elements.userFilter.options[elements.userFilter.selectedIndex].text}`;
+
+        let sprintData;
+        try {
+            sprintData = await loadShard(sprintEntry);
+        } catch (error) {
+            if(state.burnupChart) state.burnupChart.clear();
+            console.error(`Error loading sprint "${selectedSprint}":`, error);
+            return;
+        }
+        // Skip drawing if another sprint, user or view was selected while this shard was loading.
+        if (elements.viewSelector.value !== 'sprint' || elements.sprintFilter.value !== selectedSprint || elements.userFilter.value !== selectedUser) return;
         drawChart(sprintData, selectedUser, chartTitle, true);
     }
   
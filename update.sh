@@ -32,10 +32,11 @@ python jsonCreator.py
 
 echo ""
 echo "--- Local Update complete! ---"
-echo "data.json has been created. Open index.html in your browser to view the dashboard."
+echo "data.json and the data/ shards have been created. Open index.html in your browser to view the dashboard."
 
 # Once your github repository is set up, you can uncomment the following lines to commit and push changes
-git add data.json style.css index.html script.js jsonCreator.py
+# jsonCreator.py imports the other local modules, so publish them together
+git add data.json data style.css index.html script.js jsonCreator.py issueStore.py rawIssues.py asyncFetcher.py cassette.py requestScheduler.py runReport.py metricsExporter.py profiler.py
 # This will only create a commit if files have actually changed
 git diff --staged --quiet || git commit -m "chore: Update sprint data"
 